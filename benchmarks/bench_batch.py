@@ -0,0 +1,30 @@
+"""Compares building a report table tag by tag against Table.from_rows().
+
+Run from the repository root with: python -m benchmarks.bench_batch
+"""
+import timeit
+
+from htmlBuilder.tags import Table, Tr, Td
+
+ROWS = [(i, f"name {i}", i * 1.5, "ok" if i % 3 else "failed") for i in range(1000)]
+
+
+def build_manual():
+    return Table([], [Tr([], [Td([], str(value)) for value in row]) for row in ROWS])
+
+
+def build_batch():
+    return Table.from_rows(ROWS)
+
+
+def main(number=20):
+    assert build_manual().render() == build_batch().render()
+
+    manual = min(timeit.repeat(build_manual, number=number, repeat=5))
+    batch = min(timeit.repeat(build_batch, number=number, repeat=5))
+    print(f"Tr/Td constructors: {number / manual:8.1f} tables/s")
+    print(f"Table.from_rows:    {number / batch:8.1f} tables/s ({manual / batch:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compares the built-in escaping of texts and attribute values against escaping every string manually with
+html.escape before building the tree (passing the results as Markup so they are not escaped twice).
+
+Run from the repository root with: python -m benchmarks.bench_escaping
+"""
+import html
+import timeit
+
+from htmlBuilder.attributes import Class
+from htmlBuilder.tags import Body, Div, P, Span
+from htmlBuilder.utils import Markup
+
+PARAGRAPHS = [
+    f"Paragraph {i}: the quick brown fox jumps over the lazy dog. " * 4 + ("Tom & Jerry <3" if i % 5 == 0 else "")
+    for i in range(200)
+]
+LABELS = ["Price", "Quantity", "Total", "Tax & fees"]
+CLASSES = ["label", "value", "row odd", "row even"]
+
+
+def build_builtin():
+    return Body([], [
+        Div([Class(CLASSES[i % 4])],
+            Span([Class("label")], LABELS[i % 4]),
+            P([], paragraph),
+        )
+        for i, paragraph in enumerate(PARAGRAPHS)
+    ])
+
+
+def build_manual():
+    return Body([], [
+        Div([Class(Markup(html.escape(CLASSES[i % 4])))],
+            Span([Class(Markup(html.escape("label")))], Markup(html.escape(LABELS[i % 4]))),
+            P([], Markup(html.escape(paragraph))),
+        )
+        for i, paragraph in enumerate(PARAGRAPHS)
+    ])
+
+
+def main(number=200):
+    assert build_builtin().render() == build_manual().render()
+
+    manual = min(timeit.repeat(lambda: build_manual().render(), number=number, repeat=5))
+    builtin = min(timeit.repeat(lambda: build_builtin().render(), number=number, repeat=5))
+    size = len(build_builtin().render())
+    print(f"manual html.escape: {number / manual:8.0f} pages/s  ({size * number / manual / 2**20:6.1f} MiB/s)")
+    print(f"built-in escaping:  {number / builtin:8.0f} pages/s  ({size * number / builtin / 2**20:6.1f} MiB/s)"
+          f"  ({manual / builtin:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
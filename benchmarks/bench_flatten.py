@@ -0,0 +1,44 @@
+"""Compares flatten_params against the previous recursive implementation.
+
+Run from the repository root with: python -m benchmarks.bench_flatten
+"""
+import collections.abc
+import timeit
+
+from htmlBuilder.tags import Div
+from htmlBuilder.utils import flatten_params
+
+
+def recursive_flatten_params(params):
+    result = []
+    for item in params:
+        if issubclass(item.__class__, collections.abc.Iterable) and not issubclass(item.__class__, str):
+            for element in recursive_flatten_params(item):
+                result.append(element)
+        else:
+            result.append(item)
+    return result
+
+
+TAGS = [Div() for _ in range(100)]
+
+CASES = {
+    "flat tags": lambda: TAGS,
+    "list comprehension": lambda: [TAGS],
+    "nested lists": lambda: [[[["text", [tag]]] for tag in TAGS]],
+    "nested generators": lambda: [(("text", (tag for tag in TAGS[:5])) for _ in range(20))],
+}
+
+
+def main(number=2000):
+    for name, build_params in CASES.items():
+        assert flatten_params(build_params()) == recursive_flatten_params(build_params())
+
+        old = min(timeit.repeat(lambda: recursive_flatten_params(build_params()), number=number, repeat=5))
+        new = min(timeit.repeat(lambda: flatten_params(build_params()), number=number, repeat=5))
+        print(f"{name:20} recursive: {number / old:10.0f} ops/s  iterative: {number / new:10.0f} ops/s"
+              f"  ({old / new:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
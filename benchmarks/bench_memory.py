@@ -0,0 +1,51 @@
+"""Measures the memory used per node by tag trees, compared with the same nodes carrying an instance __dict__
+(the layout tags, texts and attributes had before using __slots__).
+
+Run from the repository root with: python -m benchmarks.bench_memory
+"""
+import tracemalloc
+
+from htmlBuilder.attributes import Class
+from htmlBuilder.tags import Div, Text
+
+
+class DictDiv(Div):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._name = self.__class__.__name__.lower()
+
+
+class DictText(Text):
+    pass
+
+
+class DictClass(Class):
+    def __init__(self, value):
+        super().__init__(value)
+        self._name = 'class'
+
+
+def build(tag_cls, text_cls, attribute_cls, rows=20000):
+    return Div([], [tag_cls([attribute_cls("row")], text_cls(f"row {i}")) for i in range(rows)])
+
+
+def measure(tag_cls, text_cls, attribute_cls, rows=20000):
+    tracemalloc.start()
+    tree = build(tag_cls, text_cls, attribute_cls, rows)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return current / rows, peak / rows
+
+
+def main():
+    slots_current, slots_peak = measure(Div, Text, Class)
+    dict_current, dict_peak = measure(DictDiv, DictText, DictClass)
+    print("bytes per row (div + attribute + text + row string)")
+    print(f"__slots__:      {slots_current:8.1f} (peak {slots_peak:8.1f})")
+    print(f"instance dict:  {dict_current:8.1f} (peak {dict_peak:8.1f})")
+    print(f"saved:          {dict_current - slots_current:8.1f} ({1 - slots_current / dict_current:.0%})")
+
+
+if __name__ == '__main__':
+    main()
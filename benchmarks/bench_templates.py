@@ -0,0 +1,81 @@
+"""Compares rebuilding the README "not so simple example" on every request against rendering a compiled template.
+
+Run from the repository root with: python -m benchmarks.bench_templates
+"""
+import timeit
+
+from htmlBuilder.attributes import Class
+from htmlBuilder.tags import Html, Head, Title, Body, Nav, Div, Footer, Ul, Li
+from htmlBuilder.templates import Placeholder, compile
+
+USERS = [
+    {"id": "jose", "name": "Jose", "movies": ['A beautiful mind', 'Red'], "favorite-number": 42},
+    {"id": "jaime", "name": "Jaime", "movies": ['The breakfast club', 'Fight club'], "favorite-number": 7},
+    {"id": "jhon", "name": "Jhon", "movies": ['The room', 'Yes man'], "favorite-number": 987654321},
+]
+
+
+def my_custom_nav():
+    return Nav([Class("nav pretty")],
+        Div([], "A beautiful NavBar")
+    )
+
+
+def build_page(title, users):
+    return Html([],
+        Head([],
+            Title([], title)
+        ),
+        Body([],
+            my_custom_nav(),
+            [Div([Class(f"user-{user['id']}")],
+                Div([], user['name']),
+                Ul([],
+                    [Li([], movie) for movie in user["movies"]]
+                ) if user['favorite-number'] < 100 else "Favorite number is too high"
+            ) for user in users],
+            Footer([], "My Footer"),
+        )
+    )
+
+
+def build_template():
+    # same structure as build_page, every user specific text is a placeholder
+    placeholders = [
+        {
+            "id": user["id"],
+            "name": Placeholder(f"name_{i}"),
+            "movies": [Placeholder(f"movie_{i}_{j}") for j in range(len(user["movies"]))],
+            "favorite-number": user["favorite-number"],
+        }
+        for i, user in enumerate(USERS)
+    ]
+    return compile(build_page(Placeholder("title"), placeholders), doctype=True)
+
+
+def template_values(title, users):
+    values = {"title": title}
+    for i, user in enumerate(users):
+        values[f"name_{i}"] = user["name"]
+        for j, movie in enumerate(user["movies"]):
+            values[f"movie_{i}_{j}"] = movie
+    return values
+
+
+def main(number=2000):
+    template = build_template()
+    assert template.render(**template_values("An awesome site", USERS)) == \
+        build_page("An awesome site", USERS).render(doctype=True)
+
+    rebuild = min(timeit.repeat(
+        lambda: build_page("An awesome site", USERS).render(doctype=True), number=number, repeat=5
+    ))
+    compiled = min(timeit.repeat(
+        lambda: template.render(**template_values("An awesome site", USERS)), number=number, repeat=5
+    ))
+    print(f"rebuild tree + render: {number / rebuild:12.0f} pages/s")
+    print(f"compiled template:     {number / compiled:12.0f} pages/s ({rebuild / compiled:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compares validated construction against trusted_mode() and the HtmlTag.trusted() constructor for wide and
+deep trees.
+
+Run from the repository root with: python -m benchmarks.bench_validation
+"""
+import timeit
+
+from htmlBuilder.attributes import Class, Id
+from htmlBuilder.tags import Div, Li, Span, Ul, trusted_mode
+
+WIDTH = 2000
+DEPTH = 2000
+
+
+def build_wide(new=Li):
+    return Ul([Class("list")], [new([Class("item"), Id(str(i))], new([], "label"), f"item {i}") for i in range(WIDTH)])
+
+
+def build_deep(new=Div):
+    tag = new([Class("leaf")], "text")
+    for i in range(DEPTH):
+        tag = new([Class("node"), Id(str(i))], Span([], "label"), tag)
+    return tag
+
+
+def build_wide_trusted():
+    return build_wide(Li.trusted)
+
+
+def build_deep_trusted():
+    return build_deep(Div.trusted)
+
+
+def in_trusted_mode(build):
+    def build_trusted():
+        with trusted_mode():
+            return build()
+    return build_trusted
+
+
+CASES = {
+    "wide": [("validated", build_wide), ("trusted_mode()", in_trusted_mode(build_wide)), (".trusted()", build_wide_trusted)],
+    "deep": [("validated", build_deep), ("trusted_mode()", in_trusted_mode(build_deep)), (".trusted()", build_deep_trusted)],
+}
+
+
+def main(number=20):
+    for case, variants in CASES.items():
+        baseline = None
+        for name, build in variants:
+            elapsed = min(timeit.repeat(build, number=number, repeat=5))
+            baseline = baseline or elapsed
+            print(f"{case:5} {name:15} {number / elapsed:8.1f} trees/s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""Benchmark suite used to detect performance regressions in tag construction, validation, flattening and rendering.
+
+Every benchmark reports operations per second (best of several timeit repetitions), the peak memory traced while
+running one operation and the number of memory blocks it allocated that are still alive when it returns (as seen by
+tracemalloc), which for construction benchmarks are the blocks holding the tree.
+
+Run from the repository root with:
+
+    python -m benchmarks.suite                          # run every benchmark
+    python -m benchmarks.suite -k render                # only benchmarks whose name contains "render"
+    python -m benchmarks.suite --save baseline.json     # save the results as a baseline
+    python -m benchmarks.suite --compare baseline.json  # compare against a saved baseline
+
+When comparing, benchmarks that got slower than the baseline by more than --tolerance (10% by default) are marked
+and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+
+from htmlBuilder.attributes import Class, Id, Href, Style as InlineStyle, Title as TitleAttribute, Data_
+from htmlBuilder.tags import Html, Head, Title, Body, Nav, Div, Footer, Ul, Li, Hr, P, A, Span
+from htmlBuilder.utils import flatten_params
+
+WIDTH = 2000
+DEPTH = 500
+PARAGRAPHS = 500
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore "
+    "magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo "
+    "consequat & duis aute irure dolor in <reprehenderit> in voluptate velit esse cillum dolore eu fugiat nulla."
+)
+
+USERS = [
+    {"name": "Jose", "movies": ['A beautiful mind', 'Red'], "favorite-number": 42},
+    {"name": "Jaime", "movies": ['The breakfast club', 'Fight club'], "favorite-number": 7},
+    {"name": "Jhon", "movies": ['The room', 'Yes man'], "favorite-number": 987654321},
+]
+
+
+def build_wide():
+    return Ul([Class("list")], [Li([], f"item {i}") for i in range(WIDTH)])
+
+
+def build_deep():
+    tag = Span([], "leaf")
+    for _ in range(DEPTH):
+        tag = Div([], tag)
+    return tag
+
+
+def build_text_heavy():
+    return Div([], [P([], LOREM, Hr(), LOREM) for _ in range(PARAGRAPHS)])
+
+
+def build_attribute_heavy():
+    return Div([], [
+        A([Class("link external"), Id(f"link-{i}"), Href(f"https://example.com/{i}?a=1&b=2"),
+           TitleAttribute(f"Link number {i}"), Data_("index", str(i)), InlineStyle(color='blue', margin_left='3px')],
+          f"link {i}")
+        for i in range(WIDTH)
+    ])
+
+
+def build_style_params():
+    return [
+        InlineStyle(background_color='red', bottom='35px', margin_top=f'{i}px', font_size='12px', display='block')
+        for i in range(WIDTH)
+    ]
+
+
+def build_nested_generators():
+    return [((f"text {i}", (Span() for _ in range(5))) for i in range(100)) for _ in range(4)]
+
+
+def build_readme_simple():
+    return Html([],
+        Head([],
+            Title([], "A beautiful site")
+        ),
+        Body([Class('btn btn-success'), InlineStyle(background_color='red', bottom='35px')],
+            Hr(),
+            Div([],
+                Div()
+            )
+        )
+    )
+
+
+def build_readme_users():
+    return Html([],
+        Head([],
+            Title([], "An awesome site")
+        ),
+        Body([],
+            Nav([Class("nav pretty")],
+                Div([], "A beautiful NavBar")
+            ),
+            [Div([Class(f"user-{user['name'].lower()}")],
+                Div([], user['name']),
+                Ul([],
+                    [Li([], movie) for movie in user["movies"]]
+                ) if user['favorite-number'] < 100 else "Favorite number is too high"
+            ) for user in USERS],
+            Footer([], "My Footer"),
+        )
+    )
+
+
+TREES = {
+    "wide": build_wide,
+    "deep": build_deep,
+    "text-heavy": build_text_heavy,
+    "attribute-heavy": build_attribute_heavy,
+    "readme-simple": build_readme_simple,
+    "readme-users": build_readme_users,
+}
+
+
+def _benchmarks():
+    """Returns (name, setup) pairs, setup() returns the callable measured by the benchmark"""
+    benchmarks = []
+    for name, build in TREES.items():
+        benchmarks.append((f"build {name}", lambda build=build: build))
+    for name, build in TREES.items():
+        for pretty in (False, True):
+            mode = "pretty" if pretty else "compact"
+            benchmarks.append((
+                f"render {name} {mode}",
+                lambda build=build, pretty=pretty: (lambda tag: lambda: tag.render(pretty=pretty))(build()),
+            ))
+    benchmarks.append(("build Style(**params)", lambda: build_style_params))
+    benchmarks.append((
+        "flatten_params nested generators", lambda: lambda: flatten_params(build_nested_generators()),
+    ))
+    return benchmarks
+
+
+def measure(operation, min_time=0.2, repeat=5) -> dict:
+    number = 1
+    while timeit.timeit(operation, number=number) < min_time / 10:
+        number *= 2
+    best = min(timeit.repeat(operation, number=number, repeat=repeat)) / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = operation()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return {"ops_per_sec": 1 / best, "peak_memory": peak, "allocations": allocations}
+
+
+def report(name, result, baseline=None, tolerance=0.1) -> bool:
+    """Prints a result, returns False if it is a regression when compared with `baseline`"""
+    line = (f"{name:40} {result['ops_per_sec']:12.1f} ops/s {result['peak_memory'] / 1024:10.1f} KiB peak"
+            f" {result['allocations']:8} allocs")
+    if baseline is None:
+        print(line)
+        return True
+    ratio = result['ops_per_sec'] / baseline['ops_per_sec']
+    regression = ratio < 1 - tolerance
+    print(f"{line}  {ratio:5.2f}x{'  REGRESSION' if regression else ''}")
+    return not regression
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="htmlBuilder benchmark suite")
+    parser.add_argument('-k', dest='keyword', help="only run benchmarks whose name contains KEYWORD")
+    parser.add_argument('--save', metavar='PATH', help="save the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare the results with a JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="allowed slowdown when comparing (0.1 = 10%%)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per timing repetition")
+    parser.add_argument('--repeat', type=int, default=5, help="timing repetitions, the best one is reported")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)["results"]
+
+    ok = True
+    results = {}
+    for name, setup in _benchmarks():
+        if args.keyword and args.keyword not in name:
+            continue
+        results[name] = measure(setup(), min_time=args.min_time, repeat=args.repeat)
+        ok = report(name, results[name], baseline and baseline.get(name), args.tolerance) and ok
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump({"python": platform.python_version(), "results": results}, fp, indent=2, sort_keys=True)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,17 @@
 # Attributes docstrings pulled from https://www.w3schools.com/tags/ref_attributes.asp
+from hashlib import blake2b
+
 
 class HtmlTagAttribute:
+    __slots__ = ('_value',)
     belongs_to: list = None
+    _name: str = 'htmltagattribute'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._name = cls.__name__.lower()
 
     def __init__(self, value: str):
-        self._name: str = self.__class__.__name__.lower()
         self._value: str = value
 
     @property
@@ -15,15 +22,24 @@ class HtmlTagAttribute:
     def value(self):
         return self._value
 
+    def structural_hash(self) -> str:
+        """Returns a hash of the name and value of this attribute, stable between processes"""
+        return blake2b(self._structure_key().encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+    def _structure_key(self) -> str:
+        name = self.name
+        value = str(self._value)
+        return f"{'m' if hasattr(self._value, '__html__') else 'a'}{len(name)}:{name}{len(value)}:{value}"
+
     def __str__(self):
-        return f"{self._name}='{self._value}'"
+        return f"{self.name}='{self._value}'"
 
 
 class Style(HtmlTagAttribute):
     """Specifies an inline CSS style for an element"""
+    __slots__ = ()
 
     def __init__(self, value: str = '', **params):
-        self._name: str = 'style'
         self._value: str = value
         if not value:
             self._value = "; ".join(
@@ -34,840 +50,982 @@ class Style(HtmlTagAttribute):
 
 class Data_(HtmlTagAttribute):
     """Used to store custom data private to the page or application"""
+    __slots__ = ('_data_name',)
 
     def __init__(self, name, value):
-        self._name = "data-"+name
+        self._data_name = name
         self._value = value
 
+    @property
+    def name(self):
+        return "data-"+self._data_name
+
 
 class Accept(HtmlTagAttribute):
     """Specifies the types of files that the server accepts (only for type="file")"""
+    __slots__ = ()
     belongs_to = ['Input']
 
 
 class AcceptCharset(HtmlTagAttribute):
     """Specifies the character encodings that are to be used for the form submission"""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class Accesskey(HtmlTagAttribute):
     """Specifies a shortcut key to activate/focus an element"""
+    __slots__ = ()
 
 
 class Action(HtmlTagAttribute):
     """Specifies where to send the form-data when a form is submitted"""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class Alt(HtmlTagAttribute):
     """Specifies an alternate text when the original element fails to display"""
+    __slots__ = ()
     belongs_to = ['Area', 'Img', 'Input']
 
 
 class Async(HtmlTagAttribute):
     """Specifies that the script is executed asynchronously (only for external scripts)"""
+    __slots__ = ()
     belongs_to = ['Script']
 
 
 class Autocomplete(HtmlTagAttribute):
     """Specifies whether the <form> or the <input> element should have autocomplete enabled"""
+    __slots__ = ()
     belongs_to = ['Form', 'Input']
 
 
 class Autofocus(HtmlTagAttribute):
     """Specifies that the element should automatically get focus when the page loads"""
+    __slots__ = ()
     belongs_to = ['Button', 'Input', 'Keygen', 'Select', 'Textarea']
 
 
 class Autoplay(HtmlTagAttribute):
     """Specifies that the audio/video will start playing as soon as it is ready"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Challenge(HtmlTagAttribute):
     """Specifies that the value of the <keygen> element should be challenged when submitted"""
+    __slots__ = ()
     belongs_to = ['Keygen']
 
 
 class Charset(HtmlTagAttribute):
     """Specifies the character encoding"""
+    __slots__ = ()
     belongs_to = ['Meta', 'Script']
 
 
 class Checked(HtmlTagAttribute):
     """Specifies that an <input> element should be pre-selected when the page loads 
     (for type="checkbox" or type="radio")"""
+    __slots__ = ()
     belongs_to = ['Input']
 
 
 class Cite(HtmlTagAttribute):
     """Specifies a URL which explains the quote/deleted/inserted text"""
+    __slots__ = ()
     belongs_to = ['Blockquote', 'Del', 'Ins', 'Q']
 
 
 class Class(HtmlTagAttribute):
     """Specifies one or more classnames for an element (refers to a class in a style sheet)"""
-    pass
+    __slots__ = ()
 
 
 class Cols(HtmlTagAttribute):
     """Specifies the visible width of a text area"""
+    __slots__ = ()
     belongs_to = ['Textarea']
 
 
 class Colspan(HtmlTagAttribute):
     """Specifies the number of columns a table cell should span"""
+    __slots__ = ()
     belongs_to = ['Td', 'Th']
 
 
 class Content(HtmlTagAttribute):
     """Gives the value associated with the http-equiv or name attribute"""
+    __slots__ = ()
     belongs_to = ['Meta']
 
 
 class Contenteditable(HtmlTagAttribute):
     """Specifies whether the content of an element is editable or not"""
+    __slots__ = ()
 
 
 class Contextmenu(HtmlTagAttribute):
     """Specifies a context menu for an element. The context menu appears when a user right-clicks on the element"""
+    __slots__ = ()
 
 
 class Controls(HtmlTagAttribute):
     """Specifies that audio/video controls should be displayed (such as a play/pause button etc)"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Coords(HtmlTagAttribute):
     """Specifies the coordinates of the area"""
+    __slots__ = ()
     belongs_to = ['Area']
 
 
 class Data(HtmlTagAttribute):
     """Specifies the URL of the resource to be used by the object"""
+    __slots__ = ()
     belongs_to = ['Object']
 
 
 class DataAll(HtmlTagAttribute):
     """Used to store custom data private to the page or application"""
+    __slots__ = ()
 
 
 class Datetime(HtmlTagAttribute):
     """Specifies the date and time"""
+    __slots__ = ()
     belongs_to = ['Del', 'Ins', 'Time']
 
 
 class Default(HtmlTagAttribute):
     """Specifies that the track is to be enabled if the user's preferences do not indicate 
     that another track would be more appropriate"""
+    __slots__ = ()
     belongs_to = ['Track']
 
 
 class Defer(HtmlTagAttribute):
     """Specifies that the script is executed when the page has finished parsing (only for external scripts)"""
+    __slots__ = ()
     belongs_to = ['Script']
 
 
 class Dir(HtmlTagAttribute):
     """Specifies the text direction for the content in an element"""
+    __slots__ = ()
 
 
 class Dirname(HtmlTagAttribute):
     """Specifies that the text direction will be submitted"""
+    __slots__ = ()
     belongs_to = ['Input', 'Textarea']
 
 
 class Disabled(HtmlTagAttribute):
     """Specifies that the specified element/group of elements should be disabled"""
+    __slots__ = ()
     belongs_to = ['Button', 'Fieldset', 'Input', 'Keygen', 'Optgroup', 'Option', 'Select', 'Textarea']
 
 
 class Download(HtmlTagAttribute):
     """Specifies that the target will be downloaded when a user clicks on the hyperlink"""
+    __slots__ = ()
     belongs_to = ['A', 'Area']
 
 
 class Draggable(HtmlTagAttribute):
     """Specifies whether an element is draggable or not"""
+    __slots__ = ()
 
 
 class Dropzone(HtmlTagAttribute):
     """Specifies whether the dragged data is copied, moved, or linked, when dropped"""
+    __slots__ = ()
 
 
 class Enctype(HtmlTagAttribute):
     """Specifies how the form-data should be encoded when submitting it to the server (only for method="post")"""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class For(HtmlTagAttribute):
     """Specifies which form element(s) a label/calculation is bound to"""
+    __slots__ = ()
     belongs_to = ['Label', 'Output']
 
 
 class Form(HtmlTagAttribute):
     """Specifies the name of the form the element belongs to"""
+    __slots__ = ()
     belongs_to = ['Button', 'Fieldset', 'Input', 'Keygen', 'Label', 'Meter', 'Object', 'Output', 'Select', 'Textarea']
 
 
 class Formaction(HtmlTagAttribute):
     """Specifies where to send the form-data when a form is submitted. Only for type="submit"""
+    __slots__ = ()
     belongs_to = ['Button', 'Input']
 
 
 class Headers(HtmlTagAttribute):
     """Specifies one or more headers cells a cell is related to"""
+    __slots__ = ()
     belongs_to = ['Td', 'Th']
 
 
 class Height(HtmlTagAttribute):
     """Specifies the height of the element"""
+    __slots__ = ()
     belongs_to = ['Canvas', 'Embed', 'Iframe', 'Img', 'Input', 'Object', 'Video']
 
 
 class Hidden(HtmlTagAttribute):
     """Specifies that an element is not yet, or is no longer, relevant"""
+    __slots__ = ()
 
 
 class High(HtmlTagAttribute):
     """Specifies the range that is considered to be a high value"""
+    __slots__ = ()
     belongs_to = ['Meter']
 
 
 class Href(HtmlTagAttribute):
     """Specifies the URL of the page the link goes to"""
+    __slots__ = ()
     belongs_to = ['A', 'Area', 'Base', 'Link']
 
 
 class Hreflang(HtmlTagAttribute):
     """Specifies the language of the linked document"""
+    __slots__ = ()
     belongs_to = ['A', 'Area', 'Link']
 
 
 class HttpEquiv(HtmlTagAttribute):
     """Provides an HTTP header for the information/value of the content attribute"""
+    __slots__ = ()
     belongs_to = ['Meta']
 
 
 class Id(HtmlTagAttribute):
     """Specifies a unique id for an element"""
+    __slots__ = ()
 
 
 class Ismap(HtmlTagAttribute):
     """Specifies an image as a server-side image-map"""
+    __slots__ = ()
     belongs_to = ['Img']
 
 
 class Keytype(HtmlTagAttribute):
     """Specifies the security algorithm of the key"""
+    __slots__ = ()
     belongs_to = ['Keygen']
 
 
 class Kind(HtmlTagAttribute):
     """Specifies the kind of text track"""
+    __slots__ = ()
     belongs_to = ['Track']
 
 
 class Label(HtmlTagAttribute):
     """Specifies the title of the text track"""
+    __slots__ = ()
     belongs_to = ['Track', 'Option', 'Optgroup']
 
 
 class Lang(HtmlTagAttribute):
     """Specifies the language of the element's content"""
+    __slots__ = ()
 
 
 class List(HtmlTagAttribute):
     """Refers to a <datalist> element that contains pre-defined options for an <input> element"""
+    __slots__ = ()
     belongs_to = ['Input']
 
 
 class Loop(HtmlTagAttribute):
     """Specifies that the audio/video will start over again, every time it is finished"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Low(HtmlTagAttribute):
     """Specifies the range that is considered to be a low value"""
+    __slots__ = ()
     belongs_to = ['Meter']
 
 
 class Max(HtmlTagAttribute):
     """Specifies the maximum value"""
+    __slots__ = ()
     belongs_to = ['Input', 'Meter', 'Progress']
 
 
 class Maxlength(HtmlTagAttribute):
     """Specifies the maximum number of characters allowed in an element"""
+    __slots__ = ()
     belongs_to = ['Input', 'Textarea']
 
 
 class Media(HtmlTagAttribute):
     """Specifies what media/device the linked document is optimized for"""
+    __slots__ = ()
     belongs_to = ['A', 'Area', 'Link', 'Source', 'Style']
 
 
 class Method(HtmlTagAttribute):
     """Specifies the HTTP method to use when sending form-data"""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class Min(HtmlTagAttribute):
     """Specifies a minimum value"""
+    __slots__ = ()
     belongs_to = ['Input', 'Meter']
 
 
 class Multiple(HtmlTagAttribute):
     """Specifies that a user can enter more than one value"""
+    __slots__ = ()
     belongs_to = ['Input', 'Select']
 
 
 class Muted(HtmlTagAttribute):
     """Specifies that the audio output of the video should be muted"""
+    __slots__ = ()
     belongs_to = ['Video', 'Audio']
 
 
 class Name(HtmlTagAttribute):
     """Specifies the name of the element"""
+    __slots__ = ()
     belongs_to = ['Button', 'Fieldset', 'Form', 'Iframe', 'Input', 'Keygen', 'Map', 'Meta', 'Object', 'Output', 'Param',
                   'Select', 'Textarea']
 
 
 class Novalidate(HtmlTagAttribute):
     """Specifies that the form should not be validated when submitted"""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class Onabort(HtmlTagAttribute):
     """Script to be run on abort"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Embed', 'Img', 'Object', 'Video']
 
 
 class Onafterprint(HtmlTagAttribute):
     """Script to be run after the document is printed"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onbeforeprint(HtmlTagAttribute):
     """Script to be run before the document is printed"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onbeforeunload(HtmlTagAttribute):
     """Script to be run when the document is about to be unloaded"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onblur(HtmlTagAttribute):
     """Script to be run when the element loses focus"""
-    pass
+    __slots__ = ()
 
 
 class Oncanplay(HtmlTagAttribute):
     """Script to be run when a file is ready to start playing (when it has buffered enough to begin)"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Embed', 'Object', 'Video']
 
 
 class Oncanplaythrough(HtmlTagAttribute):
     """Script to be run when a file can be played all the way to the end without pausing for buffering"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onchange(HtmlTagAttribute):
     """Script to be run when the value of the element is changed"""
-    pass
+    __slots__ = ()
 
 
 class Onclick(HtmlTagAttribute):
     """Script to be run when the element is being clicked"""
-    pass
+    __slots__ = ()
 
 
 class Oncontextmenu(HtmlTagAttribute):
     """Script to be run when a context menu is triggered"""
-    pass
+    __slots__ = ()
 
 
 class Oncopy(HtmlTagAttribute):
     """Script to be run when the content of the element is being copied"""
-    pass
+    __slots__ = ()
 
 
 class Oncuechange(HtmlTagAttribute):
     """Script to be run when the cue changes in a <track] element"""
+    __slots__ = ()
     belongs_to = ['Track']
 
 
 class Oncut(HtmlTagAttribute):
     """Script to be run when the content of the element is being cut"""
-    pass
+    __slots__ = ()
 
 
 class Ondblclick(HtmlTagAttribute):
     """Script to be run when the element is being double-clicked"""
-    pass
+    __slots__ = ()
 
 
 class Ondrag(HtmlTagAttribute):
     """Script to be run when the element is being dragged"""
-    pass
+    __slots__ = ()
 
 
 class Ondragend(HtmlTagAttribute):
     """Script to be run at the end of a drag operation"""
-    pass
+    __slots__ = ()
 
 
 class Ondragenter(HtmlTagAttribute):
     """Script to be run when an element has been dragged to a valid drop target"""
-    pass
+    __slots__ = ()
 
 
 class Ondragleave(HtmlTagAttribute):
     """Script to be run when an element leaves a valid drop target"""
-    pass
+    __slots__ = ()
 
 
 class Ondragover(HtmlTagAttribute):
     """Script to be run when an element is being dragged over a valid drop target"""
-    pass
+    __slots__ = ()
 
 
 class Ondragstart(HtmlTagAttribute):
     """Script to be run at the start of a drag operation"""
-    pass
+    __slots__ = ()
 
 
 class Ondrop(HtmlTagAttribute):
     """Script to be run when dragged element is being dropped"""
-    pass
+    __slots__ = ()
 
 
 class Ondurationchange(HtmlTagAttribute):
     """Script to be run when the length of the media changes"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onemptied(HtmlTagAttribute):
     """Script to be run when something bad happens and the file is suddenly unavailable 
     (like unexpectedly disconnects)"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onended(HtmlTagAttribute):
     """Script to be run when the media has reach the end (a useful event for messages like "thanks for listening")"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onerror(HtmlTagAttribute):
     """Script to be run when an error occurs"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Body', 'Embed', 'Img', 'Object', 'Script', 'Style', 'Video']
 
 
 class Onfocus(HtmlTagAttribute):
     """Script to be run when the element gets focus"""
-    pass
+    __slots__ = ()
 
 
 class Onhashchange(HtmlTagAttribute):
     """Script to be run when there has been changes to the anchor part of the a URL"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Oninput(HtmlTagAttribute):
     """Script to be run when the element gets user input"""
-    pass
+    __slots__ = ()
 
 
 class Oninvalid(HtmlTagAttribute):
     """Script to be run when the element is invalid"""
-    pass
+    __slots__ = ()
 
 
 class Onkeydown(HtmlTagAttribute):
     """Script to be run when a user is pressing a key"""
-    pass
+    __slots__ = ()
 
 
 class Onkeypress(HtmlTagAttribute):
     """Script to be run when a user presses a key"""
-    pass
+    __slots__ = ()
 
 
 class Onkeyup(HtmlTagAttribute):
     """Script to be run when a user releases a key"""
-    pass
+    __slots__ = ()
 
 
 class Onload(HtmlTagAttribute):
     """Script to be run when the element is finished loading"""
+    __slots__ = ()
     belongs_to = ['Body', 'Iframe', 'Img', 'Input', 'Link', 'Script', 'Style']
 
 
 class Onloadeddata(HtmlTagAttribute):
     """Script to be run when media data is loaded"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onloadedmetadata(HtmlTagAttribute):
     """Script to be run when meta data (like dimensions and duration) are loaded"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onloadstart(HtmlTagAttribute):
     """Script to be run just as the file begins to load before anything is actually loaded"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onmousedown(HtmlTagAttribute):
     """Script to be run when a mouse button is pressed down on an element"""
-    pass
+    __slots__ = ()
 
 
 class Onmousemove(HtmlTagAttribute):
     """Script to be run as long as the  mouse pointer is moving over an element"""
-    pass
+    __slots__ = ()
 
 
 class Onmouseout(HtmlTagAttribute):
     """Script to be run when a mouse pointer moves out of an element"""
-    pass
+    __slots__ = ()
 
 
 class Onmouseover(HtmlTagAttribute):
     """Script to be run when a mouse pointer moves over an element"""
-    pass
+    __slots__ = ()
 
 
 class Onmouseup(HtmlTagAttribute):
     """Script to be run when a mouse button is released over an element"""
-    pass
+    __slots__ = ()
 
 
 class Onmousewheel(HtmlTagAttribute):
     """Script to be run when a mouse wheel is being scrolled over an element"""
-    pass
+    __slots__ = ()
 
 
 class Onoffline(HtmlTagAttribute):
     """Script to be run when the browser starts to work offline"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Ononline(HtmlTagAttribute):
     """Script to be run when the browser starts to work online"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onpagehide(HtmlTagAttribute):
     """Script to be run when a user navigates away from a page"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onpageshow(HtmlTagAttribute):
     """Script to be run when a user navigates to a page"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onpaste(HtmlTagAttribute):
     """Script to be run when the user pastes some content in an element"""
-    pass
+    __slots__ = ()
 
 
 class Onpause(HtmlTagAttribute):
     """Script to be run when the media is paused either by the user or programmatically"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onplay(HtmlTagAttribute):
     """Script to be run when the media is ready to start playing"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onplaying(HtmlTagAttribute):
     """Script to be run when the media actually has started playing."""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onpopstate(HtmlTagAttribute):
     """Script to be run when the window's history changes."""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onprogress(HtmlTagAttribute):
     """Script to be run when the browser is in the process of getting the media data"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onratechange(HtmlTagAttribute):
     """Script to be run each time the playback rate changes (like when a user switches to a slow motion 
     or fast forward mode)."""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onreset(HtmlTagAttribute):
     """Script to be run when a reset button in a form is clicked."""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class Onresize(HtmlTagAttribute):
     """Script to be run when the browser window is being resized."""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onscroll(HtmlTagAttribute):
     """Script to be run when an element's scrollbar is being scrolled"""
-    pass
+    __slots__ = ()
 
 
 class Onsearch(HtmlTagAttribute):
     """Script to be run when the user writes something in a search field (for <input="search">)"""
+    __slots__ = ()
     belongs_to = ['Input']
 
 
 class Onseeked(HtmlTagAttribute):
     """Script to be run when the seeking attribute is set to false indicating that seeking has ended"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onseeking(HtmlTagAttribute):
     """Script to be run when the seeking attribute is set to true indicating that seeking is active"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onselect(HtmlTagAttribute):
     """Script to be run when the element gets selected"""
-    pass
+    __slots__ = ()
 
 
 class Onshow(HtmlTagAttribute):
     """Script to be run when a <menu] element is shown as a context menu"""
+    __slots__ = ()
     belongs_to = ['Menu']
 
 
 class Onstalled(HtmlTagAttribute):
     """Script to be run when the browser is unable to fetch the media data for whatever reason"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onstorage(HtmlTagAttribute):
     """Script to be run when a Web Storage area is updated"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onsubmit(HtmlTagAttribute):
     """Script to be run when a form is submitted"""
+    __slots__ = ()
     belongs_to = ['Form']
 
 
 class Onsuspend(HtmlTagAttribute):
     """Script to be run when fetching the media data is stopped before it is completely loaded for whatever reason"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Ontimeupdate(HtmlTagAttribute):
     """Script to be run when the playing position has changed (like when the user fast forwards 
     to a different point in the media)"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Ontoggle(HtmlTagAttribute):
     """Script to be run when the user opens or closes the <details] element"""
+    __slots__ = ()
     belongs_to = ['Details']
 
 
 class Onunload(HtmlTagAttribute):
     """Script to be run when a page has unloaded (or the browser window has been closed)"""
+    __slots__ = ()
     belongs_to = ['Body']
 
 
 class Onvolumechange(HtmlTagAttribute):
     """Script to be run each time the volume of a video/audio has been changed"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onwaiting(HtmlTagAttribute):
     """Script to be run when the media has paused but is expected to resume 
     (like when the media pauses to buffer more data)"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Onwheel(HtmlTagAttribute):
     """Script to be run when the mouse wheel rolls up or down over an element"""
-    pass
+    __slots__ = ()
 
 
 class Open(HtmlTagAttribute):
     """Specifies that the details should be visible (open) to the user"""
+    __slots__ = ()
     belongs_to = ['Details']
 
 
 class Optimum(HtmlTagAttribute):
     """Specifies what value is the optimal value for the gauge"""
+    __slots__ = ()
     belongs_to = ['Meter']
 
 
 class Pattern(HtmlTagAttribute):
     """Specifies a regular expression that an <input] element's value is checked against"""
+    __slots__ = ()
     belongs_to = ['Input']
 
 
 class Placeholder(HtmlTagAttribute):
     """Specifies a short hint that describes the expected value of the element"""
+    __slots__ = ()
     belongs_to = ['Input', 'Textarea']
 
 
 class Poster(HtmlTagAttribute):
     """Specifies an image to be shown while the video is downloading, or until the user hits the play button"""
+    __slots__ = ()
     belongs_to = ['Video']
 
 
 class Preload(HtmlTagAttribute):
     """Specifies if and how the author thinks the audio/video should be loaded when the page loads"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Video']
 
 
 class Readonly(HtmlTagAttribute):
     """Specifies that the element is read-only"""
+    __slots__ = ()
     belongs_to = ['Input', 'Textarea']
 
 
 class Rel(HtmlTagAttribute):
     """Specifies the relationship between the current document and the linked document"""
+    __slots__ = ()
     belongs_to = ['A', 'Area', 'Link']
 
 
 class Required(HtmlTagAttribute):
     """Specifies that the element must be filled out before submitting the form"""
+    __slots__ = ()
     belongs_to = ['Input', 'Select', 'Textarea']
 
 
 class Reversed(HtmlTagAttribute):
     """Specifies that the list order should be descending (9,8,7...)"""
+    __slots__ = ()
     belongs_to = ['Ol']
 
 
 class Rows(HtmlTagAttribute):
     """Specifies the visible number of lines in a text area"""
+    __slots__ = ()
     belongs_to = ['Textarea']
 
 
 class Rowspan(HtmlTagAttribute):
     """Specifies the number of rows a table cell should span"""
+    __slots__ = ()
     belongs_to = ['Td', 'Th']
 
 
 class Sandbox(HtmlTagAttribute):
     """Enables an extra set of restrictions for the content in an iframe]"""
+    __slots__ = ()
     belongs_to = ['Iframe']
 
 
 class Scope(HtmlTagAttribute):
     """Specifies whether a header cell is a header for a column, row, or group of columns or rows"""
+    __slots__ = ()
     belongs_to = ['Th']
 
 
 class Scoped(HtmlTagAttribute):
     """Specifies that the styles only apply to this element's parent element and that element's child elements"""
+    __slots__ = ()
     belongs_to = ['Style']
 
 
 class Selected(HtmlTagAttribute):
     """Specifies that an option should be pre-selected when the page loads"""
+    __slots__ = ()
     belongs_to = ['Option']
 
 
 class Shape(HtmlTagAttribute):
     """Specifies the shape of the area"""
+    __slots__ = ()
     belongs_to = ['Area']
 
 
 class Size(HtmlTagAttribute):
     """Specifies the width, in characters (for <input>) or specifies the number of visible options (for <select>)"""
+    __slots__ = ()
     belongs_to = ['Input', 'Select']
 
 
 class Sizes(HtmlTagAttribute):
     """Specifies the size of the linked resource"""
+    __slots__ = ()
     belongs_to = ['Img', 'Link', 'Source']
 
 
 class Span(HtmlTagAttribute):
     """Specifies the number of columns to span"""
+    __slots__ = ()
     belongs_to = ['Col', 'Colgroup']
 
 
 class Spellcheck(HtmlTagAttribute):
     """Specifies whether the element is to have its spelling and grammar checked or not"""
+    __slots__ = ()
 
 
 class Src(HtmlTagAttribute):
     """Specifies the URL of the media file"""
+    __slots__ = ()
     belongs_to = ['Audio', 'Embed', 'Iframe', 'Img', 'Input', 'Script', 'Source', 'Track', 'Video']
 
 
 class Srcdoc(HtmlTagAttribute):
     """Specifies the HTML content of the page to show in the iframe]"""
+    __slots__ = ()
     belongs_to = ['Iframe']
 
 
 class Srclang(HtmlTagAttribute):
     """Specifies the language of the track text data (required if kind="subtitles")"""
+    __slots__ = ()
     belongs_to = ['Track']
 
 
 class Srcset(HtmlTagAttribute):
     """Specifies the URL of the image to use in different situations"""
+    __slots__ = ()
     belongs_to = ['Img', 'Source']
 
 
 class Start(HtmlTagAttribute):
     """Specifies the start value of an ordered list"""
+    __slots__ = ()
     belongs_to = ['Ol']
 
 
 class Step(HtmlTagAttribute):
     """Specifies the legal number intervals for an input field"""
+    __slots__ = ()
     belongs_to = ['Input']
 
 
 class Tabindex(HtmlTagAttribute):
     """Specifies the tabbing order of an element"""
+    __slots__ = ()
 
 
 class Target(HtmlTagAttribute):
     """Specifies the target for where to open the linked document or where to submit the form"""
+    __slots__ = ()
     belongs_to = ['A', 'Area', 'Base', 'Form']
 
 
 class Title(HtmlTagAttribute):
     """Specifies extra information about an element"""
+    __slots__ = ()
 
 
 class Translate(HtmlTagAttribute):
     """Specifies whether the content of an element should be translated or not"""
+    __slots__ = ()
 
 
 class Type(HtmlTagAttribute):
     """Specifies the type of element"""
+    __slots__ = ()
     belongs_to = ['Button', 'Embed', 'Input', 'Link', 'Menu', 'Object', 'Script', 'Source', 'Style']
 
 
 class Usemap(HtmlTagAttribute):
     """Specifies an image as a client-side image-map"""
+    __slots__ = ()
     belongs_to = ['Img', 'Object']
 
 
 class Value(HtmlTagAttribute):
     """Specifies the value of the element"""
+    __slots__ = ()
     belongs_to = ['Button', 'Input', 'Li', 'Option', 'Meter', 'Progress', 'Param']
 
 
 class Width(HtmlTagAttribute):
     """Specifies the width of the element"""
+    __slots__ = ()
     belongs_to = ['Canvas', 'Embed', 'Iframe', 'Img', 'Input', 'Object', 'Video']
 
 
 class Wrap(HtmlTagAttribute):
     """Specifies how the text in a text area is to be wrapped when submitted in a form"""
+    __slots__ = ()
     belongs_to = ['Textarea']
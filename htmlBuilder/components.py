@@ -0,0 +1,94 @@
+from collections import OrderedDict, namedtuple
+import functools
+import inspect
+import threading
+from time import monotonic
+
+from htmlBuilder.exceptions import HtmlBuildError
+from .tags import HtmlTag
+
+ComponentCacheInfo = namedtuple('ComponentCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_KWARGS_MARK = object()
+
+
+def component(func=None, maxsize=128, ttl=None, ignore=()):
+    """Memoizes a function that returns a tag, so calling it again with the same arguments returns the same tag
+    without building it again::
+
+        @component(maxsize=256, ttl=60, ignore=['request'])
+        def product_card(product_id, title, request=None):
+            return Div([Class("card")], H5([], title), A([Href(f"/p/{product_id}")], "Details"))
+
+    The returned tags are frozen, so their rendered html is also computed once for each combination of render options
+    and reused in every page that contains them. Arguments must be hashable, the ones named in `ignore` are left out
+    of the key. The least recently used results are discarded when there are more than `maxsize` of them (None for no
+    limit), and results older than `ttl` seconds are built again.
+
+    The decorated function gets `cache_info()` and `cache_clear()` methods, like functools.lru_cache.
+    """
+    if func is None:
+        return lambda func: component(func, maxsize=maxsize, ttl=ttl, ignore=ignore)
+
+    ignore = frozenset(ignore)
+    signature = inspect.signature(func) if ignore else None
+    # name of the **kwargs parameter, which is bound as a dict and has to be made hashable
+    var_keyword = None
+    if signature is not None:
+        if not ignore <= set(signature.parameters):
+            unknown = ', '.join(sorted(ignore - set(signature.parameters)))
+            raise HtmlBuildError(f"{func.__qualname__} has no parameters named {unknown}")
+        for name, parameter in signature.parameters.items():
+            if parameter.kind is parameter.VAR_KEYWORD:
+                var_keyword = name
+
+    entries = OrderedDict()
+    lock = threading.Lock()
+    counters = [0, 0]  # hits, misses
+
+    def make_key(args, kwargs):
+        if signature is None:
+            return (args, _KWARGS_MARK, *sorted(kwargs.items())) if kwargs else args
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple(
+            (name, tuple(sorted(value.items())) if name == var_keyword else value)
+            for name, value in bound.arguments.items() if name not in ignore
+        )
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(args, kwargs)
+        with lock:
+            entry = entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > monotonic()):
+                entries.move_to_end(key)
+                counters[0] += 1
+                return entry[0]
+            counters[1] += 1
+
+        tag = func(*args, **kwargs)
+        if not isinstance(tag, HtmlTag):
+            raise HtmlBuildError(f"Components must return a tag, {func.__qualname__} returned {tag!r}")
+        tag.freeze()
+
+        with lock:
+            entries[key] = tag, (monotonic() + ttl if ttl is not None else None)
+            entries.move_to_end(key)
+            if maxsize is not None:
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+        return tag
+
+    def cache_info() -> ComponentCacheInfo:
+        with lock:
+            return ComponentCacheInfo(counters[0], counters[1], maxsize, len(entries))
+
+    def cache_clear():
+        with lock:
+            entries.clear()
+            counters[0] = counters[1] = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return wrapper
@@ -0,0 +1,70 @@
+import zlib
+
+from htmlBuilder.exceptions import HtmlBuildError
+from .utils import DEFAULT_WRITE_BUFFER_SIZE
+
+try:
+    import bz2
+except ImportError:  # Python built without bz2 support
+    bz2 = None
+try:
+    import lzma
+except ImportError:  # Python built without lzma support
+    lzma = None
+
+
+def _zlib_compressor(wbits, default_level):
+    def new_compressor(level=None):
+        return zlib.compressobj(default_level if level is None else level, zlib.DEFLATED, wbits)
+    return new_compressor
+
+
+# every codec creates objects with the interface of the standard library compressors: compress(data) returns the
+# compressed data available so far and flush() returns the rest
+_codecs = {
+    'gzip': _zlib_compressor(16 + zlib.MAX_WBITS, 6),
+    'deflate': _zlib_compressor(zlib.MAX_WBITS, 6),  # zlib format, what HTTP calls "deflate"
+}
+if bz2 is not None:
+    _codecs['bz2'] = lambda level=None: bz2.BZ2Compressor(9 if level is None else level)
+if lzma is not None:
+    _codecs['lzma'] = lambda level=None: lzma.LZMACompressor(preset=level)
+
+
+def register_codec(name, new_compressor):
+    """Makes a compression codec available by name. `new_compressor(level)` must return an object with compress()
+    and flush() methods, like zlib.compressobj() (`level` is None when not given)"""
+    _codecs[name] = new_compressor
+
+
+def available_codecs() -> tuple:
+    return tuple(_codecs)
+
+
+def iter_compressed(chunks, codec='gzip', level=None, encoding='utf-8', buffer_size=DEFAULT_WRITE_BUFFER_SIZE):
+    """Compresses an iterable of strings while it is being produced, yielding the compressed data.
+
+    Chunks are encoded and passed to the compressor in groups of at least `buffer_size` characters.
+    """
+    try:
+        new_compressor = _codecs[codec]
+    except KeyError:
+        raise HtmlBuildError(f"Unknown compression codec '{codec}', available codecs: {', '.join(_codecs)}")
+    compressor = new_compressor(level)
+
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            data = compressor.compress("".join(buffer).encode(encoding))
+            if data:
+                yield data
+            buffer = []
+            buffered = 0
+    if buffer:
+        data = compressor.compress("".join(buffer).encode(encoding))
+        if data:
+            yield data
+    yield compressor.flush()
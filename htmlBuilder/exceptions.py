@@ -6,3 +6,6 @@ class InvalidAttributeError(HtmlBuildError, TypeError):
 
 class NestingError(HtmlBuildError):
     pass
+
+class FrozenTagError(HtmlBuildError):
+    pass
@@ -0,0 +1,75 @@
+import copy
+
+INLINE_TAGS = frozenset([
+    'a', 'abbr', 'b', 'bdi', 'bdo', 'br', 'cite', 'code', 'data', 'dfn', 'em', 'i', 'img', 'kbd', 'label', 'mark', 'q',
+    's', 'samp', 'small', 'span', 'strong', 'sub', 'sup', 'time', 'u', 'var', 'wbr',
+])
+
+
+class Formatter:
+    """Layout of the html rendered in pretty mode, pass it as the `pretty` argument of render() (or any other render
+    method) instead of True.
+
+    Every tag and text goes in its own line, indented with `indent_width` spaces (or a tab with `use_tabs`) per
+    nesting level, except for:
+
+    - Tags listed in `inline_tags` (tag classes or names, INLINE_TAGS has the usual ones), which are written in a
+      single line with their inner html.
+    - Tags whose inner html only has texts and inline tags, which are written in a single line when it takes at most
+      `line_width` characters (counting the indentation).
+
+    `Formatter()` produces the same html as `pretty=True`. Tags with asynchronous inner html are always laid out in
+    multiple lines, and so are tags containing template Placeholders, unless they are inline tags (the size of the
+    content of a placeholder is not known when compiling the template).
+    """
+
+    def __init__(self, indent_width=2, use_tabs=False, line_width=None, inline_tags=()):
+        self.indent = "\t" if use_tabs else " " * indent_width
+        self.line_width = line_width
+        self.inline_tags = frozenset(getattr(tag, '__name__', tag).lower() for tag in inline_tags)
+        self.has_layout_rules = bool(self.inline_tags) or line_width is not None
+        # indentation strings of every nesting level, built once
+        self._indentations = ['']
+
+    def indentation(self, nesting_level) -> str:
+        try:
+            return self._indentations[nesting_level]
+        except IndexError:
+            indentations = self._indentations
+            while len(indentations) <= nesting_level:
+                indentations.append(indentations[-1] + self.indent)
+            return indentations[nesting_level]
+
+    def without_layout_rules(self):
+        """Returns a formatter with the same indentation that writes every tag in multiple lines"""
+        if not self.has_layout_rules:
+            return self
+        formatter = copy.copy(self)
+        formatter.line_width = None
+        formatter.inline_tags = frozenset()
+        formatter.has_layout_rules = False
+        return formatter
+
+    def __repr__(self):
+        return (f"Formatter(indent={self.indent!r}, line_width={self.line_width!r}, "
+                f"inline_tags={sorted(self.inline_tags)!r})")
+
+
+DEFAULT_FORMATTER = Formatter()
+
+
+class _Minified:
+    """Render mode producing minified html. It is passed to nodes as their `pretty` argument and it is falsy, so
+    nodes that don't support minifying render compact html"""
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return 'MINIFIED'
+
+    def __reduce__(self):
+        return 'MINIFIED'
+
+
+MINIFIED = _Minified()
@@ -0,0 +1,97 @@
+from collections import OrderedDict, namedtuple
+import threading
+
+from . import tags
+
+FragmentCacheInfo = namedtuple('FragmentCacheInfo', ['hits', 'misses', 'evictions', 'entries', 'bytes'])
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_MIN_NODES = 8
+
+
+class FragmentCache:
+    """LRU cache of the rendered html of subtrees, keyed by their structural hash and the render options.
+
+    Once enabled, every render looks up the tags with at least `min_nodes` nodes (counting texts) before rendering
+    them, so structurally identical subtrees (like the same product card built again in another request) are only
+    rendered once::
+
+        fragments.enable(max_entries=10000, max_bytes=64 * 1024 * 1024)
+        page.render()
+        print(fragments.cache_info())
+
+    The least recently used entries are evicted when there are more than `max_entries`, or when the cached html takes
+    more than `max_bytes` (UTF-8 encoded). Modified tags get a new structural hash, so stale html is never used.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, min_nodes=DEFAULT_MIN_NODES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.min_nodes = min_nodes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def __setitem__(self, key, html):
+        size = tags._utf8_length(html)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = html, size
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cache_info(self) -> FragmentCacheInfo:
+        with self._lock:
+            return FragmentCacheInfo(self._hits, self._misses, self._evictions, len(self._entries), self._bytes)
+
+    def clear(self):
+        """Removes every entry and resets the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+
+def enable(max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, min_nodes=DEFAULT_MIN_NODES) -> FragmentCache:
+    """Creates the process-wide fragment cache used by every render, and returns it"""
+    cache = FragmentCache(max_entries=max_entries, max_bytes=max_bytes, min_nodes=min_nodes)
+    tags.set_fragment_cache(cache)
+    return cache
+
+
+def disable():
+    tags.set_fragment_cache(None)
+
+
+def get_cache():
+    """Returns the process-wide fragment cache, or None if it isn't enabled"""
+    return tags._fragment_cache
+
+
+def cache_info() -> FragmentCacheInfo:
+    cache = get_cache()
+    return cache.cache_info() if cache is not None else FragmentCacheInfo(0, 0, 0, 0, 0)
@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import multiprocessing
+import os
+import sys
+
+from .tags import HtmlTag, DOCTYPE
+
+DEFAULT_PARALLEL_THRESHOLD = 50000
+
+
+def _count_nodes(root) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, HtmlTag):
+            stack.extend(node._inner_html)
+    return count
+
+
+def _render_subtrees(subtrees, pretty):
+    return [tag._render(pretty, nesting_level) for tag, nesting_level in subtrees]
+
+
+if sys.version_info >= (3, 7) and 'fork' in multiprocessing.get_all_start_methods():
+    _fork_context = multiprocessing.get_context('fork')
+else:
+    _fork_context = None
+
+_shared_tree = None
+
+
+def _share_tree(tag):
+    global _shared_tree
+    _shared_tree = tag
+
+
+def _render_shared_subtrees(subtrees, pretty):
+    result = []
+    for path, nesting_level in subtrees:
+        tag = _shared_tree
+        for index in path:
+            tag = tag._inner_html[index]
+        result.append(tag._render(pretty, nesting_level))
+    return result
+
+
+class ParallelRenderer:
+    """Renders big trees splitting them into independent subtrees that are rendered in a pool of processes.
+
+    The result is the same as calling render() on the tree. Trees with less than `threshold` nodes are rendered in
+    the current process.
+
+    Where the `fork` start method is available, a pool of processes is forked for each render so the workers inherit
+    the tree and only the positions of the subtrees are sent to them. Otherwise a single pool is kept (use the
+    renderer as a context manager, or call close(), to shut it down) and the subtrees are pickled, so Lazy inner html
+    (which usually wraps generators) is only supported close to the root of the tree.
+    """
+
+    def __init__(self, max_workers=None, threshold=DEFAULT_PARALLEL_THRESHOLD):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def render(self, tag: HtmlTag, pretty=False, doctype=False) -> str:
+        prefix = DOCTYPE()._render(pretty=pretty) if doctype else ''
+        total = _count_nodes(tag)
+        if total < self.threshold or self.max_workers < 2:
+            return prefix + tag._render(pretty=pretty, nesting_level=0)
+
+        pieces = self._split(tag, pretty, total)
+
+        # longest subtrees first, each one to the least loaded worker
+        batches = [[] for _ in range(self.max_workers)]
+        loads = [0] * self.max_workers
+        jobs = [i for i, piece in enumerate(pieces) if not isinstance(piece, str)]
+        for i in sorted(jobs, key=lambda i: pieces[i][2], reverse=True):
+            worker = loads.index(min(loads))
+            batches[worker].append(i)
+            loads[worker] += pieces[i][2]
+        batches = [batch for batch in batches if batch]
+
+        if _fork_context is not None:
+            subtrees = [[(pieces[i][3], pieces[i][1]) for i in batch] for batch in batches]
+            with ProcessPoolExecutor(
+                    max_workers=len(batches), mp_context=_fork_context, initializer=_share_tree, initargs=(tag,)
+            ) as executor:
+                results = list(executor.map(_render_shared_subtrees, subtrees, repeat(pretty)))
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            subtrees = [[pieces[i][:2] for i in batch] for batch in batches]
+            results = self._executor.map(_render_subtrees, subtrees, repeat(pretty))
+
+        for batch, rendered in zip(batches, results):
+            for i, html in zip(batch, rendered):
+                pieces[i] = html
+        return prefix + "".join(pieces)
+
+    def _split(self, tag, pretty, total) -> list:
+        """Returns the rendered html of the tree as a list of strings and (subtree, nesting level, size, path) jobs,
+        expanding the biggest subtrees until there are enough jobs for every worker. `path` holds the positions of
+        the subtree and its ancestors in their parents' inner html"""
+        pieces = [(tag, 0, total, ())]
+        jobs_count = 1
+        target = self.max_workers * 4
+        while jobs_count < target:
+            candidates = [
+                i for i, piece in enumerate(pieces)
+                if not isinstance(piece, str) and piece[0]._inner_html
+                and piece[0].__class__._render_parts is HtmlTag._render_parts
+            ]
+            if not candidates:
+                break
+            index = max(candidates, key=lambda i: pieces[i][2])
+            node, level, size, path = pieces[index]
+            if size * target < total:
+                break
+
+            opening, children, closing = node._render_parts(pretty, level)
+            expanded = [opening]
+            for position, child in enumerate(children):
+                if isinstance(child, HtmlTag):
+                    expanded.append((child, level + 1, _count_nodes(child), path + (position,)))
+                else:
+                    expanded.append(child._render(pretty, level + 1))
+            expanded.append(closing)
+            pieces[index:index + 1] = expanded
+            jobs_count += sum(1 for piece in expanded if not isinstance(piece, str)) - 1
+        return pieces
@@ -0,0 +1,102 @@
+from collections import namedtuple
+from time import perf_counter
+
+from . import tags
+
+ProfileStats = namedtuple('ProfileStats', ['calls', 'nodes', 'total_time', 'self_time', 'size'])
+
+
+class Profiler:
+    """Collects how much time and output each tag class (or labeled subtree) takes while rendering.
+
+    Rendering is instrumented while the profiler is used as a context manager (or between start() and stop())::
+
+        profiler = Profiler()
+        profiler.label(sidebar, "sidebar")
+        with profiler:
+            page.render()
+        print(profiler.report())
+
+    Tags are grouped by class name, except labeled tags, which are grouped by their label. For every group it records
+    the number of renders, the tags rendered inside them (including themselves), the total time, the time spent
+    outside of nested tags and the characters produced. Only synchronous renders in the current process are
+    instrumented (not arender() or ParallelRenderer workers). Tags whose html is taken from a render cache, and tags
+    that a Formatter writes in a single line, are counted without their inner html, since it is not walked apart.
+    """
+
+    def __init__(self):
+        self._labels = {}
+        self._stats = {}
+        self._folded = {}
+        # [tag, key, path, start time, start size, time in nested tags, nested tags]
+        self._frames = []
+        self._previous_hook = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._previous_hook = tags.set_render_hook(self)
+
+    def stop(self):
+        tags.set_render_hook(self._previous_hook)
+        self._previous_hook = None
+
+    def label(self, tag: tags.HtmlTag, name: str):
+        """Groups the renders of `tag` under `name` instead of its class name"""
+        self._labels[id(tag)] = tag, name
+
+    def clear(self):
+        self._stats.clear()
+        self._folded.clear()
+
+    def enter(self, tag, emitted):
+        labeled = self._labels.get(id(tag))
+        key = labeled[1] if labeled is not None and labeled[0] is tag else tag.__class__.__name__
+        path = f"{self._frames[-1][2]};{key}" if self._frames else key
+        self._frames.append([tag, key, path, perf_counter(), emitted, 0.0, 0])
+
+    def leave(self, tag, emitted):
+        end = perf_counter()
+        frames = self._frames
+        # a render that was not consumed to the end leaves its frames behind
+        while frames[-1][0] is not tag:
+            frames.pop()
+        _, key, path, start, start_emitted, nested_time, nested_nodes = frames.pop()
+        total_time = end - start
+        self_time = total_time - nested_time
+        if frames:
+            frames[-1][5] += total_time
+            frames[-1][6] += nested_nodes + 1
+
+        calls, nodes, group_total_time, group_self_time, size = self._stats.get(key, (0, 0, 0.0, 0.0, 0))
+        self._stats[key] = ProfileStats(
+            calls + 1, nodes + nested_nodes + 1, group_total_time + total_time, group_self_time + self_time,
+            size + emitted - start_emitted,
+        )
+        self._folded[path] = self._folded.get(path, 0.0) + self_time
+
+    def stats(self) -> dict:
+        """Returns a ProfileStats for every tag class name or label"""
+        return dict(self._stats)
+
+    def report(self, sort='self_time', limit=None) -> str:
+        """Returns a table with the stats of every group, sorted by `sort` (any ProfileStats field) descending"""
+        rows = sorted(self._stats.items(), key=lambda item: getattr(item[1], sort), reverse=True)[:limit]
+        width = max([len(name) for name, _ in rows] + [len("name")])
+        lines = [f"{'name':{width}} {'calls':>8} {'nodes':>9} {'total ms':>10} {'self ms':>10} {'chars':>11}"]
+        for name, stat in rows:
+            lines.append(
+                f"{name:{width}} {stat.calls:8} {stat.nodes:9} {stat.total_time * 1000:10.3f}"
+                f" {stat.self_time * 1000:10.3f} {stat.size:11}"
+            )
+        return "\n".join(lines)
+
+    def folded(self) -> str:
+        """Returns the self time (in microseconds) of every stack of tags, in the folded format read by flamegraph
+        tools (`html;body;div 1234`)"""
+        return "\n".join(f"{path} {round(seconds * 1e6)}" for path, seconds in self._folded.items())
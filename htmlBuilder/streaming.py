@@ -0,0 +1,117 @@
+from htmlBuilder.exceptions import HtmlBuildError, NestingError
+from .tags import HtmlTag, SelfClosingHtmlTag, Text, DOCTYPE, _iter_chunks, _indentation
+from .utils import flatten_params, write_chunks, Markup
+
+
+class _OpenTag:
+    """Context manager returned by HtmlStream.open(), closes the tag when exiting"""
+    __slots__ = ('stream', 'tag', 'depth')
+
+    def __init__(self, stream, tag, depth):
+        self.stream = stream
+        self.tag = tag
+        self.depth = depth
+
+    def __enter__(self):
+        return self.tag
+
+    def __exit__(self, *exc_info):
+        # tags opened inside this one that were not closed yet are closed too
+        while len(self.stream._open_tags) > self.depth:
+            self.stream._close_tag()
+
+
+class HtmlStream:
+    """Writes a document into a stream (anything accepted by HtmlTag.render_to()) while it is being built.
+
+    Tags opened with open() are written as soon as they are opened and closed when their context ends, and elements
+    passed to write() are rendered and written right away, so the tree of the whole document is never kept in memory.
+    The output is the same as rendering the equivalent tree (except for the layout rules of Formatters, see below)::
+
+        with HtmlStream(response, doctype=True) as stream:
+            with stream.open(Html()):
+                stream.write(Head([], Title([], "Report")))
+                with stream.open(Body()):
+                    for row in rows:
+                        stream.write(Div([], row))
+
+    When `flush` is True the stream's flush() method is called after each write.
+
+    With a Formatter that has layout rules (inline tags or a line width), tags opened with open() are always laid out
+    in multiple lines, since their content is not known when they are written. Elements passed to write() follow
+    the formatter's rules.
+    """
+
+    def __init__(self, fp, pretty=False, doctype=False, encoding=None, flush=True):
+        self._fp = fp
+        self._pretty = pretty
+        self._encoding = encoding
+        self._flush = flush and hasattr(fp, 'flush')
+        # [tag, has_inner_html] for each open tag
+        self._open_tags = []
+        if doctype:
+            self._emit([DOCTYPE()._render(pretty=pretty)])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self, tag: HtmlTag) -> _OpenTag:
+        """Writes the start tag of `tag` (and its current inner html), the end tag is written when the context ends"""
+        if not isinstance(tag, HtmlTag):
+            raise HtmlBuildError(f"Only HtmlTag instances can be opened, [{tag}->{tag.__class__.__name__}] found")
+        if isinstance(tag, SelfClosingHtmlTag):
+            raise NestingError(f"SelfClosingHtmlTag {tag.name} can't be opened")
+
+        level = len(self._open_tags)
+        chunks = self._start_child()
+        start_tag = tag._render_start_tag()
+        chunks.append(f"{_indentation(self._pretty, level)}{start_tag}" if self._pretty else start_tag)
+        self._open_tags.append([tag, False])
+        self._emit(chunks)
+        if tag.inner_html:
+            self.write(tag.inner_html)
+        return _OpenTag(self, tag, level)
+
+    def write(self, *inner_content):
+        """Renders and writes elements (anything accepted as inner html) into the innermost open tag"""
+        inner_content = flatten_params(inner_content)
+        HtmlTag.validate_inner_html(inner_content)
+        raw_text = bool(self._open_tags) and self._open_tags[-1][0]._raw_text
+        level = len(self._open_tags)
+        for item in inner_content:
+            if isinstance(item, str):
+                item = Text(Markup(item) if raw_text else item)
+            chunks = self._start_child()
+            self._emit(chunks)
+            self._emit(_iter_chunks(item, pretty=self._pretty, nesting_level=level))
+
+    def close(self):
+        """Closes every open tag"""
+        while self._open_tags:
+            self._close_tag()
+
+    def _start_child(self) -> list:
+        # in pretty mode, the line of the parent's start tag is only ended once it is known to have inner html
+        if self._open_tags and not self._open_tags[-1][1]:
+            self._open_tags[-1][1] = True
+            if self._pretty:
+                return ["\n"]
+        return []
+
+    def _close_tag(self):
+        tag, has_inner_html = self._open_tags.pop()
+        level = len(self._open_tags)
+        if not self._pretty:
+            self._emit([tag._end_tag])
+        elif has_inner_html:
+            self._emit([f"{_indentation(self._pretty, level)}{tag._end_tag}\n"])
+        else:
+            self._emit([f"{tag._end_tag}\n"])
+
+    def _emit(self, chunks):
+        write_chunks(chunks, self._fp, encoding=self._encoding)
+        if self._flush:
+            self._fp.flush()
@@ -1,25 +1,760 @@
-from htmlBuilder.exceptions import HtmlBuildError, InvalidAttributeError, NestingError
+from htmlBuilder.exceptions import HtmlBuildError, InvalidAttributeError, NestingError, FrozenTagError
 from .attributes import HtmlTagAttribute
-from .utils import flatten_params
-
+from .formatting import DEFAULT_FORMATTER, MINIFIED
+from .compression import iter_compressed
+from .utils import (
+    flatten_params, write_chunks, escape, Markup, DEFAULT_WRITE_BUFFER_SIZE, ESCAPE_CACHE_SIZE, ESCAPE_CACHE_MAX_LENGTH,
+    _BufferWriter,
+)
+
+from collections import namedtuple
+from hashlib import blake2b
+from contextlib import contextmanager
 from itertools import repeat, chain
+import asyncio
+import inspect
+import re
+import sys
+import threading
+import weakref
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses'])
+_cache_counters = [0, 0]
+
+
+def render_cache_info() -> CacheInfo:
+    """Returns the number of rendered html lookups that were served from a tag's render cache (hits) and the ones
+    that had to be rendered and stored (misses)"""
+    return CacheInfo(*_cache_counters)
+
+
+def reset_render_cache_info():
+    _cache_counters[:] = [0, 0]
+
+
+_render_hook = None
+_fragment_cache = None
+
+
+def set_render_hook(hook):
+    """Sets the object notified around the rendering of every tag and returns the previous one (None disables it).
+
+    The hook must have `enter(tag, emitted)` and `leave(tag, emitted)` methods, `emitted` being the number of
+    characters produced so far by the current render. See htmlBuilder.profiling.Profiler.
+    """
+    global _render_hook
+    previous = _render_hook
+    _render_hook = hook
+    return previous
+
+
+def set_fragment_cache(cache):
+    """Sets the cache of rendered subtrees consulted by every render and returns the previous one (None disables it).
+
+    See htmlBuilder.fragments.FragmentCache.
+    """
+    global _fragment_cache
+    previous = _fragment_cache
+    _fragment_cache = cache
+    return previous
+
+
+class _ValidationState(threading.local):
+    trusted = False
+
+
+_validation_state = _ValidationState()
+
+
+@contextmanager
+def trusted_mode():
+    """Tags created or modified inside this context (in the current thread) skip the validation of their attributes
+    and inner html. Only use it with code known to build valid trees"""
+    previous = _validation_state.trusted
+    _validation_state.trusted = True
+    try:
+        yield
+    finally:
+        _validation_state.trusted = previous
+
+
+def _indentation(pretty, nesting_level) -> str:
+    """Returns the indentation of a line at `nesting_level`, `pretty` is True or a Formatter"""
+    formatter = DEFAULT_FORMATTER if pretty is True else pretty
+    try:
+        return formatter._indentations[nesting_level]
+    except IndexError:
+        return formatter.indentation(nesting_level)
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+# characters that require quoting an attribute value (the rest are escaped)
+_UNQUOTED_UNSAFE = re.compile(r'[ \t\n\r\f=`]')
+
+
+def _collapse_whitespace(text) -> str:
+    if '  ' in text or '\n' in text or '\t' in text or '\r' in text or '\f' in text:
+        return _WHITESPACE.sub(' ', text)
+    return text
+
+
+def _render_mode(pretty, minify):
+    if not minify:
+        return pretty
+    if pretty:
+        raise HtmlBuildError("Html can't be rendered minified and pretty at the same time")
+    return MINIFIED
+
+
+class _Chunk:
+    """Already rendered html, used to splice the chunks of a subtree rendered apart into the current render"""
+    __slots__ = ('chunk',)
+    _render_cache = None
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+
+    def _render(self, pretty=False, nesting_level=0) -> str:
+        return self.chunk
+
+    def _render_parts(self, pretty, nesting_level):
+        return self.chunk, (), ''
 
 
 class Text:
+    """Text content of a tag, html special characters are escaped when rendering unless `text` is a Markup instance"""
+    __slots__ = ('text',)
+    _render_cache = None
+
     def __init__(self, text):
         self.text = text
 
-    def _render(self, pretty=False, nesting_level=None) -> str:
-        separator = "\n" if pretty else ''
-        indentation = "  "*nesting_level if pretty else ''
-        return f"{indentation}{self.text}{separator}"
+    def _render(self, pretty=False, nesting_level=0) -> str:
+        if not pretty:
+            if pretty is MINIFIED and not isinstance(self.text, Markup):
+                return escape(_collapse_whitespace(self.text))
+            return escape(self.text)
+        return f"{_indentation(pretty, nesting_level)}{escape(self.text)}\n"
+
+    def _render_parts(self, pretty, nesting_level):
+        return self._render(pretty, nesting_level), (), ''
+
+    def _in_raw_text(self):
+        """Returns the node to use when this text is the content of a raw text element (like a script)"""
+        return self
+
+    def structural_hash(self) -> str:
+        """Returns a hash of this text, stable between processes"""
+        return blake2b(self._structure_key().encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+    def _structure_key(self) -> str:
+        text = self.text
+        return f"{'m' if isinstance(text, Markup) else 't'}{len(text)}:{text}"
 
     def __str__(self):
         return self.text
 
 
+class Lazy:
+    """Wraps an iterable of inner html elements so it is consumed while the tag containing it is rendered instead
+    of when the tag is created. Elements are validated as they are produced.
+
+    Iterators (like generators) can only be consumed once, so tags containing them can only be rendered once.
+    """
+    __slots__ = ('iterable',)
+    _render_cache = None
+
+    def __init__(self, iterable):
+        self.iterable = iterable
+
+    def _iter_inner_html(self):
+        for item in self.iterable:
+            yield from _as_nodes(item)
+
+    def _render(self, pretty=False, nesting_level=0) -> str:
+        return "".join(_iter_chunks(self, pretty=pretty, nesting_level=nesting_level))
+
+    def _render_parts(self, pretty, nesting_level):
+        return '', self._iter_inner_html(), ''
+
+
+def _is_async(item) -> bool:
+    return inspect.isawaitable(item) or hasattr(item, '__aiter__')
+
+
+def _as_nodes(item) -> list:
+    """Validates an inner html element produced while rendering and returns it as a list of nodes"""
+    items = [item] if isinstance(item, (str, HtmlTag, Text)) else flatten_params([item])
+    HtmlTag.validate_inner_html(items)
+    return [
+        Text(element) if isinstance(element, str) else Async(element) if _is_async(element) else element
+        for element in items
+    ]
+
+
+_ASYNC_END = object()
+_CONSUMED = object()
+
+
+async def _drain(async_iterable, queue):
+    try:
+        async for item in async_iterable:
+            queue.put_nowait(item)
+    finally:
+        queue.put_nowait(_ASYNC_END)
+
+
+class Async:
+    """Inner html produced by an awaitable (like a coroutine) or by an async iterable (like an async generator).
+
+    Tags are wrapped in it automatically when they receive such elements, and can then only be rendered with
+    arender(). Their content can only be consumed once, so tags containing them can only be rendered once, rendering
+    them again raises HtmlBuildError.
+    """
+    __slots__ = ('source', '_result')
+    _render_cache = None
+
+    def __init__(self, source):
+        self.source = source
+        self._result = None
+
+    def _render_parts(self, pretty, nesting_level):
+        raise HtmlBuildError("Tags with asynchronous inner html (awaitables, async iterables) must be rendered with arender()")
+
+    def _start(self, started):
+        """Starts producing the content in the running event loop (adding this node to `started`), returns a future or
+        a (queue, task) pair"""
+        if self._result is None:
+            if hasattr(self.source, '__aiter__'):
+                queue = asyncio.Queue()
+                self._result = queue, asyncio.ensure_future(_drain(self.source, queue))
+            else:
+                self._result = asyncio.ensure_future(self.source)
+            started.append(self)
+        elif self._result is _CONSUMED:
+            raise HtmlBuildError("Asynchronous inner html can only be rendered once")
+        return self._result
+
+    def _stop(self):
+        """Cancels the production of the content if it is not done, the node can't be rendered again"""
+        result = self._result
+        (result[1] if isinstance(result, tuple) else result).cancel()
+        self._result = _CONSUMED
+
+
+def _iter_chunks(root, pretty=False, nesting_level=0, cache=False, notify=True):
+    """Renders a node tree without recursion.
+
+    Every node describes itself through `_render_parts(pretty, nesting_level)`, which returns its opening fragment,
+    its children and its closing fragment. Pending closing fragments are kept in the same stack as pending nodes
+    (with a `None` nesting level) so the output is produced in document order. Children given as a list are nested
+    one level deeper, children given as an iterator take the place of the node and are consumed one by one.
+
+    Nodes with a `_render_cache` dict get their whole rendered html stored there (keyed by the render options) the
+    first time they are rendered, and reused afterwards instead of walking their children again. When `cache` is
+    True every HtmlTag in the tree gets one. When it is None only the caches of frozen tags are used, so the chunks
+    of the other tags are produced again (like the template slots that cached html doesn't have).
+
+    When a fragment cache is set, it is used like a render cache for the tags that are big enough, keyed by their
+    structural hash, so the html of identical subtrees of different trees is reused.
+
+    When a render hook is set it is notified when each HtmlTag starts rendering and, through a `_LEAVE` entry pushed
+    below the tag's closing fragment, when it is done. Walks done while rendering a node (like the ones measuring
+    whether a tag fits in a line) pass `notify=False`, so tags aren't reported twice.
+    """
+    hook = _render_hook if notify else None
+    fragments = _fragment_cache
+    emitted = 0
+    stack = [(root, nesting_level)]
+    pop = stack.pop
+    push = stack.append
+    captures = []
+    while stack:
+        node, level = pop()
+        if level is None:
+            chunk = node
+        elif level is _PENDING:
+            items, level = node
+            child = next(items, _PENDING)
+            if child is not _PENDING:
+                push((node, _PENDING))
+                push((child, level))
+            continue
+        elif level is _CAPTURE_END:
+            store, key = node
+            chunk = store[key] = "".join(captures.pop())
+            if captures:
+                captures[-1].append(chunk)
+            continue
+        elif level is _LEAVE:
+            hook.leave(node, emitted)
+            continue
+        else:
+            if hook is not None:
+                # tags rendered without their end tag are reported as themselves
+                tag = node.tag if node.__class__ is _WithoutEndTag else node
+                if isinstance(tag, HtmlTag):
+                    hook.enter(tag, emitted)
+                    push((tag, _LEAVE))
+            node_cache = node._render_cache
+            if node_cache is None:
+                if cache and isinstance(node, HtmlTag):
+                    node_cache = node._render_cache = {}
+            elif cache is None and not node._frozen:
+                node_cache = None
+            if node_cache is not None:
+                key = (pretty, level if pretty else 0)
+                chunk = node_cache.get(key)
+                if chunk is not None:
+                    _cache_counters[0] += 1
+                    if captures:
+                        captures[-1].append(chunk)
+                    if hook is not None:
+                        emitted += len(chunk)
+                    yield chunk
+                    continue
+                _cache_counters[1] += 1
+                push(((node_cache, key), _CAPTURE_END))
+                captures.append([])
+            elif fragments is not None and isinstance(node, HtmlTag):
+                digest, nodes = node._hash or _hash_tree(node)
+                if digest is not None and nodes >= fragments.min_nodes:
+                    key = (digest, pretty, level if pretty else 0)
+                    chunk = fragments.get(key)
+                    if chunk is not None:
+                        if captures:
+                            captures[-1].append(chunk)
+                        if hook is not None:
+                            emitted += len(chunk)
+                        yield chunk
+                        continue
+                    push(((fragments, key), _CAPTURE_END))
+                    captures.append([])
+
+            chunk, children, closing = node._render_parts(pretty, level)
+            if closing:
+                push((closing, None))
+            if children:
+                if isinstance(children, list):
+                    level += 1
+                    for child in reversed(children):
+                        push((child, level))
+                else:
+                    push(((children, level), _PENDING))
+        if captures:
+            captures[-1].append(chunk)
+        if hook is not None:
+            emitted += len(chunk)
+        yield chunk
+
+
+_CAPTURE_END = object()
+_PENDING = object()
+_LEAVE = object()
+
+
+def _scan_async(root, containers, started):
+    """Starts producing the content of the Async nodes of a tree (adding them to `started`) and adds the ids of the
+    tags containing them to `containers`"""
+    path = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            path.pop()
+        elif isinstance(node, HtmlTag):
+            path.append(node)
+            stack.append(None)
+            stack.extend(reversed(node._inner_html))
+        elif isinstance(node, Async):
+            node._start(started)
+            for tag in reversed(path):
+                if id(tag) in containers:
+                    break
+                containers.add(id(tag))
+
+
+async def _aiter_chunks(root, pretty=False, nesting_level=0, chunk_size=DEFAULT_WRITE_BUFFER_SIZE):
+    """Asynchronous version of _iter_chunks.
+
+    The content of every Async node is requested before rendering starts, so it is produced concurrently. Subtrees
+    without Async nodes are rendered with _iter_chunks. Rendered html is yielded in chunks of about `chunk_size`
+    characters, and whatever is rendered is yielded before waiting for content that is not ready yet.
+    """
+    containers = set()
+    # Async nodes started by this render, they can't be rendered again
+    started = []
+    _scan_async(root, containers, started)
+    # tags with asynchronous inner html are always laid out in multiple lines
+    container_pretty = pretty.without_layout_rules() if pretty and pretty is not True else pretty
+    buffer = []
+    buffered = 0
+    stack = [(root, nesting_level)]
+    pop = stack.pop
+    push = stack.append
+
+    def push_nodes(items, level):
+        for item in reversed(items):
+            if isinstance(item, HtmlTag):
+                _scan_async(item, containers, started)
+            elif isinstance(item, Async):
+                item._start(started)
+            push((item, level))
+
+    try:
+        while stack:
+            node, level = pop()
+            if level is None:
+                buffer.append(node)
+                buffered += len(node)
+            elif level is _PENDING:
+                async_node, level = node
+                queue, task = async_node._result
+                if queue.empty() and buffer:
+                    yield "".join(buffer)
+                    buffer, buffered = [], 0
+                item = await queue.get()
+                if item is _ASYNC_END:
+                    await task  # raises the errors of the async iterable
+                    continue
+                push((node, _PENDING))
+                push_nodes(_as_nodes(item), level)
+            elif isinstance(node, Async):
+                result = node._start(started)
+                if isinstance(result, tuple):
+                    push(((node, level), _PENDING))
+                    continue
+                if not result.done() and buffer:
+                    yield "".join(buffer)
+                    buffer, buffered = [], 0
+                push_nodes(_as_nodes(await result), level)
+            elif id(node) in containers or node.__class__ is _WithoutEndTag and id(node.tag) in containers:
+                if pretty is MINIFIED and node._preserve_whitespace:
+                    # like _render_minified_parts(), but rendering the inner html asynchronously
+                    opening, _, closing = node._render_minified_parts()
+                    buffer.append(opening)
+                    yield "".join(buffer)
+                    buffer, buffered = [], 0
+                    for child in node._inner_html:
+                        async for chunk in _aiter_chunks(child, nesting_level=level + 1, chunk_size=chunk_size):
+                            yield chunk
+                    push((closing, None))
+                    continue
+                opening, children, closing = node._render_parts(container_pretty, level)
+                buffer.append(opening)
+                buffered += len(opening)
+                if closing:
+                    push((closing, None))
+                level += 1
+                for child in reversed(children):  # already scanned
+                    push((child, level))
+            else:
+                for chunk in _iter_chunks(node, pretty=pretty, nesting_level=level):
+                    buffer.append(chunk)
+                    buffered += len(chunk)
+
+            if buffered >= chunk_size:
+                yield "".join(buffer)
+                buffer, buffered = [], 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        # when the render ends early (like when the client disconnects) the content still being produced is dropped
+        for node in started:
+            node._stop()
+
+
+def _forget_parent(children):
+    """Returns the callback of a weak reference to the parent of `children`, which removes it from their parents
+    when the parent is garbage collected, so tags shared by many trees don't accumulate dead references"""
+    def callback(parent_ref):
+        for child in children:
+            if isinstance(child, HtmlTag):
+                _remove_parent(child, parent_ref)
+    return callback
+
+
+def _remove_parent(tag, parent_ref):
+    # `_parents` is None, the weak reference to the only parent, or a set of weak references to several parents
+    parents = tag._parents
+    if parents is parent_ref:
+        tag._parents = None
+    elif parents.__class__ is set:
+        parents.discard(parent_ref)
+
+
+def _live_parents(tag):
+    parents = tag._parents
+    if parents is None:
+        return []
+    refs = list(parents) if parents.__class__ is set else [parents]
+    return [parent for parent in (ref() for ref in refs) if parent is not None]
+
+
+def _iter_tags(root):
+    """Yields `root` and all of its HtmlTag descendants"""
+    stack = [root]
+    while stack:
+        tag = stack.pop()
+        yield tag
+        stack.extend(item for item in tag._inner_html if isinstance(item, HtmlTag))
+
+
+# structural key of every hashable tag or text class (None for classes with a custom rendering)
+_class_keys = {}
+_UNHASHABLE = (None, 0)
+
+
+def _hash_tree(root):
+    """Computes the structural hash of `root` and of its tags without one, returns its (hash, number of nodes).
+
+    Every tag keeps its (hash, number of nodes) in `_hash`, the hash is None when the html of the tree doesn't only
+    depend on its structure. Tags are hashed in reverse depth-first order, so children are hashed before parents.
+    """
+    pending = []
+    stack = [root]
+    while stack:
+        tag = stack.pop()
+        if tag._hash is None:
+            pending.append(tag)
+            stack.extend([child for child in tag._inner_html if isinstance(child, HtmlTag)])
+    for tag in reversed(pending):
+        tag._hash = _hash_tag(tag)
+    return root._hash
+
+
+def _class_key(cls):
+    try:
+        return _class_keys[cls]
+    except KeyError:
+        if issubclass(cls, Text):
+            hashable = cls._render_parts is Text._render_parts and cls._render is Text._render
+        else:
+            hashable = cls._render_parts is HtmlTag._render_parts or (
+                cls._render_parts is _render_as_fragment and cls._render is SelfClosingHtmlTag._render
+            )
+        key = _class_keys[cls] = f"{cls.__module__}.{cls.__qualname__}" if hashable else None
+        return key
+
+
+def _hash_tag(tag):
+    # the tag's class, attributes, texts and the hashes of its child tags are serialized into a single string, every
+    # variable length field prefixed by its length so different structures can't produce the same string
+    class_key = _class_key(tag.__class__)
+    if class_key is None:
+        return _UNHASHABLE
+
+    pieces = [class_key]
+    if tag._name is not tag.__class__._name:
+        pieces.append(f"n{len(tag._name)}:{tag._name}")
+    for attribute in tag._attributes:
+        pieces.append(attribute._structure_key())
+    nodes = 1
+    for child in tag._inner_html:
+        if child.__class__ is Text:
+            pieces.append(child._structure_key())
+            nodes += 1
+        elif isinstance(child, HtmlTag):
+            child_digest, child_nodes = child._hash
+            if child_digest is None:
+                return _UNHASHABLE
+            pieces.append(child_digest)
+            nodes += child_nodes
+        elif isinstance(child, Text) and _class_key(child.__class__) is not None:
+            pieces.append(child._structure_key())
+            nodes += 1
+        else:
+            return _UNHASHABLE
+    return blake2b("\0".join(pieces).encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest(), nodes
+
+
+TreeStats = namedtuple('TreeStats', ['nodes', 'depth', 'tags', 'text_length', 'compact_size', 'pretty_size'])
+
+
+if hasattr(str, 'isascii'):
+    def _utf8_length(text) -> int:
+        return len(text) if text.isascii() else len(text.encode('utf-8'))
+else:
+    def _utf8_length(text) -> int:
+        return len(text.encode('utf-8'))
+
+
+def _tree_stats(root):
+    """Measures a tree in one iterative pass, returns its TreeStats and the number of lines it takes in pretty mode.
+
+    The pretty size is computed as if the tree was rendered at nesting level 0, the same tree rendered at level `n`
+    takes `2 * n` more bytes per line. Each open tag has a frame with the sizes of its start and end tags, whether it
+    has inner html, and the compact size, pretty size (at the tag's level) and lines of its inner html.
+    """
+    tags = {}
+    nodes = text_length = depth = 0
+    frames = [[0, 0, True, 0, 0, 0]]
+    stack = [(root, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, level = pop()
+        if node is _LEAVE:
+            start, end, has_inner_html, inner_compact, inner_pretty, inner_lines = frames.pop()
+            compact = start + inner_compact + end
+            if has_inner_html:
+                pretty, lines = start + 1 + inner_pretty + end + 1, inner_lines + 2
+            else:
+                pretty, lines = start + end + 1, 1
+        elif isinstance(node, Text) and node.__class__._render is Text._render:
+            nodes += 1
+            text_length += len(node.text)
+            compact = _utf8_length(escape(node.text))
+            pretty, lines = compact + 1, 1
+        elif isinstance(node, HtmlTag):
+            if node._stats is not None:
+                stats, lines = node._stats
+                nodes += stats.nodes
+                depth = max(depth, level + stats.depth)
+                text_length += stats.text_length
+                for name, count in stats.tags.items():
+                    tags[name] = tags.get(name, 0) + count
+                compact, pretty = stats.compact_size, stats.pretty_size
+            else:
+                nodes += 1
+                cls = node.__class__
+                name = cls.__name__
+                tags[name] = tags.get(name, 0) + 1
+                if level >= depth:
+                    depth = level + 1
+                if cls._render_parts is HtmlTag._render_parts:
+                    inner_html = node._inner_html
+                    frames.append([_utf8_length(node._render_start_tag()), len(node._end_tag), bool(inner_html), 0, 0, 0])
+                    push((_LEAVE, None))
+                    level += 1
+                    for child in reversed(inner_html):
+                        push((child, level))
+                    continue
+                if cls._render is SelfClosingHtmlTag._render:
+                    attributes = node._attributes
+                    compact = len(node._self_closing_tag)
+                    if attributes:
+                        compact += _utf8_length(_render_attributes(attributes))
+                    pretty, lines = compact + 1, 1
+                else:
+                    compact, pretty, lines = _measure_rendering(node)
+        elif isinstance(node, (Lazy, Async)):
+            raise HtmlBuildError("Stats of trees with Lazy or asynchronous inner html can't be computed")
+        else:
+            nodes += 1
+            compact, pretty, lines = _measure_rendering(node)
+
+        # children are one level deeper than their parent
+        parent = frames[-1]
+        parent[3] += compact
+        parent[4] += pretty + 2 * lines
+        parent[5] += lines
+
+    _, _, _, compact, pretty, lines = frames[0]
+    stats = TreeStats(nodes, depth, tags, text_length, compact, pretty - 2 * lines)
+    return stats, lines
+
+
+def _measure_rendering(node):
+    """Returns the compact size, pretty size and lines of a node with a custom rendering, rendering it"""
+    pretty = _utf8_length(node._render(True, 0))
+    lines = (_utf8_length(node._render(True, 1)) - pretty) // 2
+    return _utf8_length(node._render(False, 0)), pretty, lines
+
+
+def _tag_strings(name) -> dict:
+    name = sys.intern(name)
+    return {
+        '_name': name,
+        '_start_tag_prefix': sys.intern(f"<{name}"),
+        '_start_tag': sys.intern(f"<{name}>"),
+        '_end_tag': sys.intern(f"</{name}>"),
+        '_self_closing_tag': sys.intern(f"<{name}/>"),
+    }
+
+
+def _set_tag_attribute(self, attribute, value):
+    object.__setattr__(self, attribute, value)
+    if attribute == '_name':
+        # a tag renamed after being created (like in its __init__) renders with its own name
+        self.__dict__.update(_tag_strings(value))
+        if hasattr(self, '_frozen'):
+            self.invalidate()
+
+
+def _render_as_fragment(self, pretty, nesting_level):
+    return self._render(pretty, nesting_level), (), ''
+
+
+def _render_attributes(attributes) -> str:
+    return "".join([f" {attribute.name}='{escape(attribute.value)}'" for attribute in attributes])
+
+
+_minified_values = {}
+
+
+def _minified_value(value) -> str:
+    """Returns `=value`, quoting the escaped value only if needed. Results for short strings are memoized"""
+    result = _minified_values.get(value) if value.__class__ is str else None
+    if result is None:
+        escaped = escape(value)
+        result = f"={escaped}" if escaped and not _UNQUOTED_UNSAFE.search(escaped) else f"='{escaped}'"
+        if value.__class__ is str and len(value) <= ESCAPE_CACHE_MAX_LENGTH:
+            if len(_minified_values) >= ESCAPE_CACHE_SIZE:
+                _minified_values.clear()
+            _minified_values[value] = result
+    return result
+
+
+def _render_minified_attributes(attributes) -> str:
+    return "".join([f" {attribute.name}{_minified_value(attribute.value)}" for attribute in attributes])
+
+
+class _WithoutEndTag:
+    """Renders a tag without its end tag, used for optional end tags in minified html"""
+    __slots__ = ('tag',)
+    _render_cache = None
+    _preserve_whitespace = False
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def _render_parts(self, pretty, nesting_level):
+        opening, children, _ = self.tag._render_minified_parts()
+        return opening, children, ''
+
+
+class _DefaultRendering:
+    """Renders a tag that customizes _render with the rendering of HtmlTag, used when the custom _render calls it
+    through super()"""
+    __slots__ = ('tag',)
+    _render_cache = None
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def _render_parts(self, pretty, nesting_level):
+        return HtmlTag._render_parts(self.tag, pretty, nesting_level)
+
+
 class HtmlTag:
+    __slots__ = ('_attributes', '_inner_html', '_render_cache', '_stats', '_hash', '_parents', '_frozen', '__weakref__')
     belongs_to: list = None
+    # the text of raw text elements (like scripts) is not escaped
+    _raw_text = False
+    # whitespace is kept when minifying the inner html of these tags
+    _preserve_whitespace = False
+    # when minifying, the end tag is omitted if the next sibling is one of these tags, or if there is no next sibling
+    # and the parent is not one of `_keep_end_tag_in`
+    _omit_end_tag_before = None
+    _keep_end_tag_in = frozenset()
+
+    @classmethod
+    def _init_tag_names(cls):
+        # precomputed once per class, rendering only concatenates them. Custom elements set their name with a `_name`
+        # class attribute (like `_name = "my-widget"`), by default it is the lowercased class name
+        for attribute, value in _tag_strings(cls.__dict__.get('_name') or cls.__name__.lower()).items():
+            setattr(cls, attribute, value)
 
     @classmethod
     def validate_attributes(cls, attributes):
@@ -38,24 +773,31 @@ class HtmlTag:
             if not (
                 isinstance(item, str) or
                 issubclass(item.__class__, HtmlTag) or
-                isinstance(item, Text)):
+                isinstance(item, (Text, Lazy, Async)) or
+                _is_async(item)):
                 raise HtmlBuildError(f"All inner_html elements must be 'HtmlTag' or 'str' instances, [{item}->{item.__class__.__name__}] found")
         return True
 
     def __init__(self, attributes=tuple(), *inner_content):
-        self._name = self.__class__.__name__.lower()
-        self.attributes = attributes
+        self._attributes = attributes
         self._inner_html = []
-
-        self.validate_attributes(self.attributes)
+        self._render_cache = None
+        self._stats = None
+        self._hash = None
+        self._parents = None
+        self._frozen = False
 
         inner_content = flatten_params(inner_content)
-        self.validate_inner_html(inner_content)
-        for item in inner_content:
-            if isinstance(item, str):
-                self._inner_html.append(Text(item))
-            else:
-                self._inner_html.append(item)
+        if not _validation_state.trusted:
+            self.validate_attributes(self._attributes)
+            self.validate_inner_html(inner_content)
+        self._set_inner_html(inner_content)
+
+    @classmethod
+    def trusted(cls, attributes=tuple(), *inner_content):
+        """Creates a tag like the constructor does, but without validating its attributes and inner html and without
+        calling custom __init__ methods"""
+        return cls._build(attributes, flatten_params(inner_content))
 
     @property
     def inner_html(self):
@@ -63,680 +805,1034 @@ class HtmlTag:
 
     @inner_html.setter
     def inner_html(self, content):
-        self.validate_inner_html(flatten_params(content))
-        self._inner_html = []
-        for item in content:
-            if isinstance(item, str):
-                self._inner_html.append(Text(item))
-            else:
-                self._inner_html.append(item)
+        self._check_not_frozen()
+        content = flatten_params(content)
+        if not _validation_state.trusted:
+            self.validate_inner_html(content)
+        for item in self._inner_html:
+            # tags included more than once are no longer linked to this tag after their first occurrence
+            if isinstance(item, HtmlTag) and item._parents is not None:
+                for parent_ref in list(item._parents) if item._parents.__class__ is set else [item._parents]:
+                    if parent_ref() is self:
+                        _remove_parent(item, parent_ref)
+        self._set_inner_html(content)
+        self.invalidate()
+
+    @property
+    def attributes(self):
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._check_not_frozen()
+        if not _validation_state.trusted:
+            self.validate_attributes(attributes)
+        self._attributes = attributes
+        self.invalidate()
 
     @property
     def name(self) -> str:
         return self._name
 
-    def render(self, pretty=False, doctype=False) -> str:
-        result = ''
-        if doctype:
-            result += DOCTYPE()._render(pretty=pretty)
-        result+= self._render(pretty=pretty, nesting_level=0)
-        return result
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self):
+        """Makes this tag and all of its descendants immutable. Its rendered html is then computed once for each
+        combination of render options and reused on every render of any tree containing it. Returns the tag itself"""
+        for tag in _iter_tags(self):
+            tag._frozen = True
+        if self._render_cache is None:
+            self._render_cache = {}
+        return self
+
+    def invalidate(self):
+        """Discards the cached rendered html, stats and structural hash of this tag and of every tag containing it.
+        This is done automatically when the `inner_html` or `attributes` setters are used, call it after modifying
+        those lists in place"""
+        stack = [self]
+        seen = set()
+        while stack:
+            tag = stack.pop()
+            if id(tag) in seen:
+                continue
+            seen.add(id(tag))
+            if not tag._frozen:
+                tag._render_cache = None
+            tag._stats = None
+            tag._hash = None
+            stack.extend(_live_parents(tag))
+
+    def stats(self) -> TreeStats:
+        """Returns the size of this tree without rendering it: its number of nodes (tags and texts), its depth, the
+        number of tags of each class, the length of its texts and the exact size in bytes of its UTF-8 encoded html
+        in compact and pretty mode (without doctype).
+
+        The stats are computed in a single pass and kept until the tree is modified, stats kept by subtrees are
+        reused. Trees with Lazy or asynchronous inner html can't be measured without consuming it.
+        """
+        if self._stats is None:
+            self._stats = _tree_stats(self)
+        stats, _ = self._stats
+        return stats._replace(tags=dict(stats.tags))
+
+    def structural_hash(self) -> str:
+        """Returns a hash of the structure of this tree (tag classes, attributes and texts), stable between processes:
+        structurally identical trees always have the same hash, and render the same html.
+
+        It is computed bottom-up and kept by every tag of the tree until it is modified. Trees with Lazy or
+        asynchronous inner html, or with nodes with a custom rendering, can't be hashed.
+        """
+        digest, _ = self._hash if self._hash is not None else _hash_tree(self)
+        if digest is None:
+            raise HtmlBuildError(
+                "Trees with Lazy or asynchronous inner html, or with custom rendered nodes, can't be hashed"
+            )
+        return digest
+
+    def _set_inner_html(self, content):
+        inner_html = []
+        self_ref = None
+        for item in content:
+            if isinstance(item, str):
+                item = Text(Markup(item) if self._raw_text else item)
+            elif isinstance(item, HtmlTag):
+                if self_ref is None:
+                    self_ref = weakref.ref(self, _forget_parent(inner_html))
+                parents = item._parents
+                if parents is None:
+                    item._parents = self_ref
+                elif parents.__class__ is set:
+                    parents.add(self_ref)
+                elif parents is not self_ref:
+                    item._parents = {parents, self_ref}
+            elif _is_async(item):
+                item = Async(item)
+            elif self._raw_text and isinstance(item, Text):
+                item = item._in_raw_text()
+            inner_html.append(item)
+        self._inner_html = inner_html
+
+    def __getstate__(self):
+        # parent references and render caches are not pickled, they are rebuilt when unpickling
+        return self._attributes, self._inner_html, self._frozen, getattr(self, '__dict__', None)
+
+    def __setstate__(self, state):
+        self._attributes, content, self._frozen, instance_dict = state
+        self._render_cache = None
+        self._stats = None
+        self._hash = None
+        self._parents = None
+        self._set_inner_html(content)
+        if instance_dict:
+            self.__dict__.update(instance_dict)
 
-    def _render(self, pretty=False, nesting_level=None) -> str:
-        separator = "\n" if pretty else ''
-        indentation = "  "*nesting_level if pretty else ''
+    @classmethod
+    def _build(cls, attributes, content):
+        """Creates a tag skipping __init__ and validation, `attributes` and `content` must be already validated"""
+        tag = cls.__new__(cls)
+        tag._attributes = attributes
+        tag._render_cache = None
+        tag._stats = None
+        tag._hash = None
+        tag._parents = None
+        tag._frozen = False
+        tag._set_inner_html(content)
+        return tag
+
+    def _check_not_frozen(self):
+        if self._frozen:
+            raise FrozenTagError(f"{self.name} is frozen and can't be modified")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._init_tag_names()
+        if '__slots__' not in cls.__dict__ and '__setattr__' not in cls.__dict__:
+            # instances of this class have a __dict__, so they can be renamed by assigning `_name`
+            cls.__setattr__ = _set_tag_attribute
+        if '_render' in cls.__dict__ and '_render_parts' not in cls.__dict__:
+            # tags that customize _render are rendered as a single fragment
+            cls._render_parts = _render_as_fragment
+
+    def render(self, pretty=False, doctype=False, cache=False, minify=False) -> str:
+        """Returns the html text of this tag. With `cache=True` every tag in the tree keeps its rendered html, so
+        following renders only redo the tags that were modified (and the tags containing them).
+
+        With `minify=True` the html is made as small as possible: whitespace in texts is collapsed (except inside
+        pre, textarea, script and style tags), attribute values are only quoted when needed, void elements have no
+        slash and optional end tags (of li, option, p, td, th and tr) are omitted where HTML allows it.
+        """
+        return "".join(self.iter_render(pretty=pretty, doctype=doctype, cache=cache, minify=minify))
+
+    def iter_render(self, pretty=False, doctype=False, cache=False, minify=False):
+        """Yields the rendered html in depth-first order fragments, joining them gives the same result as render()"""
+        pretty = _render_mode(pretty, minify)
+        if doctype:
+            yield DOCTYPE()._render(pretty=pretty)
+        yield from self._iter_render(pretty=pretty, nesting_level=0, cache=cache)
 
-        tag_components: list = [
-                f"{indentation}<{self._name}",
-            ] + [
-                f" {attribute.name}='{str(attribute.value)}'" for attribute in self.attributes
-            ] + [
-                f">{separator if self.inner_html else ''}",
-                "".join((tag._render(pretty, nesting_level+1) for tag in self.inner_html)),
-                f"{indentation if self.inner_html else ''}</{self._name}>{separator}",
-            ]
+    async def arender(self, pretty=False, doctype=False, chunk_size=DEFAULT_WRITE_BUFFER_SIZE, minify=False):
+        """Asynchronous version of iter_render(), supports awaitables and async iterables in the inner html.
 
-        return "".join(tag_components)
+        Their content is produced concurrently but rendered in document order, and the html rendered so far is
+        yielded before waiting for content that is not ready yet.
+        """
+        pretty = _render_mode(pretty, minify)
+        if doctype:
+            yield DOCTYPE()._render(pretty=pretty)
+        async for chunk in _aiter_chunks(self, pretty=pretty, nesting_level=0, chunk_size=chunk_size):
+            yield chunk
+
+    def render_to(self, fp, pretty=False, doctype=False, cache=False, encoding=None,
+                  buffer_size=DEFAULT_WRITE_BUFFER_SIZE, minify=False) -> int:
+        """Writes the rendered html into a text or binary stream, a socket or a bytearray without building the whole
+        string first. Returns the number of characters (bytes for binary targets) written"""
+        return write_chunks(
+            self.iter_render(pretty=pretty, doctype=doctype, cache=cache, minify=minify), fp, encoding=encoding,
+            buffer_size=buffer_size,
+        )
+
+    def render_bytes(self, pretty=False, doctype=False, cache=False, minify=False) -> bytes:
+        """Returns the UTF-8 encoded html of this tag"""
+        return self.render(pretty=pretty, doctype=doctype, cache=cache, minify=minify).encode('utf-8')
+
+    def render_compressed(self, codec='gzip', level=None, pretty=False, doctype=False, cache=False, minify=False,
+                          buffer_size=DEFAULT_WRITE_BUFFER_SIZE) -> bytes:
+        """Returns the html compressed with `codec` ('gzip', 'deflate', 'bz2', 'lzma' or one added with
+        htmlBuilder.compression.register_codec()), compressing it while it is rendered"""
+        return b"".join(self.iter_compressed(
+            codec=codec, level=level, pretty=pretty, doctype=doctype, cache=cache, minify=minify, buffer_size=buffer_size
+        ))
+
+    def iter_compressed(self, codec='gzip', level=None, pretty=False, doctype=False, cache=False, minify=False,
+                        buffer_size=DEFAULT_WRITE_BUFFER_SIZE):
+        """Yields the compressed html (see render_compressed()) as it is rendered, ready to be sent"""
+        return iter_compressed(
+            self.iter_render(pretty=pretty, doctype=doctype, cache=cache, minify=minify), codec=codec, level=level,
+            buffer_size=buffer_size,
+        )
+
+    def render_into(self, buffer, offset=0, pretty=False, doctype=False, cache=False,
+                    buffer_size=DEFAULT_WRITE_BUFFER_SIZE, minify=False) -> int:
+        """Writes the UTF-8 encoded html into a preallocated writable buffer (like a bytearray, a memoryview or an
+        mmap) starting at `offset`, and returns the number of bytes written.
+
+        The size of the html is known in advance through stats(), so a ValueError is raised before rendering
+        anything if it doesn't fit in the buffer.
+        """
+        if minify or pretty and pretty is not True and (
+                pretty.indent != DEFAULT_FORMATTER.indent or pretty.has_layout_rules):
+            # stats() only measures the compact html and the default pretty layout
+            html = self.render_bytes(pretty=pretty, doctype=doctype, cache=cache, minify=minify)
+            return _BufferWriter(buffer, offset).write(html)
+        stats = self.stats()
+        size = stats.pretty_size if pretty else stats.compact_size
+        if doctype:
+            size += len(DOCTYPE()._render(pretty=pretty))
+        available = memoryview(buffer).nbytes - offset
+        if size > available:
+            raise ValueError(f"The html takes {size} bytes but only {available} are available in the buffer")
+        return write_chunks(
+            self.iter_render(pretty=pretty, doctype=doctype, cache=cache), _BufferWriter(buffer, offset),
+            encoding='utf-8', buffer_size=buffer_size,
+        )
+
+    def _render(self, pretty=False, nesting_level=0) -> str:
+        if self.__class__._render_parts is _render_as_fragment:
+            # called by a custom _render through super(), using _render_parts would call it again
+            return "".join(_iter_chunks(_DefaultRendering(self), pretty=pretty, nesting_level=nesting_level))
+        return "".join(self._iter_render(pretty=pretty, nesting_level=nesting_level))
+
+    def _iter_render(self, pretty=False, nesting_level=0, cache=False):
+        return _iter_chunks(self, pretty=pretty, nesting_level=nesting_level, cache=cache)
+
+    def _render_start_tag(self) -> str:
+        if self._attributes:
+            return f"{self._start_tag_prefix}{_render_attributes(self._attributes)}>"
+        return self._start_tag
+
+    def _render_parts(self, pretty, nesting_level):
+        inner_html = self._inner_html
+        if not pretty:
+            if pretty is MINIFIED:
+                return self._render_minified_parts()
+            return self._render_start_tag(), inner_html, self._end_tag
+
+        start_tag = self._render_start_tag()
+        if pretty is not True and pretty.has_layout_rules:
+            parts = self._render_single_line(pretty, nesting_level)
+            if parts is not None:
+                return parts
+        indentation = _indentation(pretty, nesting_level)
+        if inner_html:
+            return f"{indentation}{start_tag}\n", inner_html, f"{indentation}{self._end_tag}\n"
+        return f"{indentation}{start_tag}", inner_html, f"{self._end_tag}\n"
+
+    def _render_minified_parts(self):
+        attributes = self._attributes
+        start_tag = f"{self._start_tag_prefix}{_render_minified_attributes(attributes)}>" if attributes else self._start_tag
+        inner_html = self._inner_html
+        if self._preserve_whitespace:
+            return start_tag, map(_Chunk, chain.from_iterable(map(_iter_chunks, inner_html))), self._end_tag
+
+        children = inner_html
+        last = len(inner_html) - 1
+        for position, child in enumerate(inner_html):
+            following = getattr(child.__class__, '_omit_end_tag_before', None)
+            if following is None or child.__class__._render_parts is not HtmlTag._render_parts:
+                continue
+            if position == last:
+                omit = self._name not in child._keep_end_tag_in
+            else:
+                sibling = inner_html[position + 1]
+                omit = isinstance(sibling, HtmlTag) and sibling._name in following
+            if omit:
+                if children is inner_html:
+                    children = list(inner_html)
+                children[position] = _WithoutEndTag(child)
+        return start_tag, children, self._end_tag
+
+    def _render_single_line(self, formatter, nesting_level):
+        """Returns the parts of this tag written in a single line if the formatter's rules allow it, else None"""
+        inner_html = self._inner_html
+        inline = self._name in formatter.inline_tags
+        if not inline:
+            if formatter.line_width is None or not inner_html:
+                return None
+            for item in inner_html:
+                if not (isinstance(item, Text) or isinstance(item, HtmlTag) and item._name in formatter.inline_tags):
+                    return None
+
+        indentation = _indentation(formatter, nesting_level)
+        chunks = list(_iter_chunks(self, cache=None, notify=False))
+        if all(chunk.__class__ is str for chunk in chunks):
+            if not inline and len(indentation) + sum(map(len, chunks)) > formatter.line_width:
+                return None
+            return f"{indentation}{''.join(chunks)}\n", (), ''
+        # chunks with extra information (like template slots) are passed on as they are. Whether the content of a
+        # slot fits in the line is only known when it is filled, so only inline tags are written in a single line
+        if not inline:
+            return None
+        return indentation, map(_Chunk, chunks), "\n"
+
+
+HtmlTag._init_tag_names()
 
 
 class SelfClosingHtmlTag(HtmlTag):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self._inner_html:
             raise NestingError(f"SelfClosingHtmlTag {self.name} must not have inner html, {self._inner_html[0].name} was found")
 
 
-    def _render(self, pretty=False, nesting_level=None) -> str:
-        separator = "\n" if pretty else ''
-        indentation = "  "*nesting_level if pretty else ''
-        tag_components: list = [
-                                   f"{indentation}<{self._name}",
-                               ] + [
-                                   f" {attribute.name}='{str(attribute.value)}'" for attribute in self.attributes
-                               ] + [
-                                   f"/>{separator}",
-                               ]
-        return "".join(tag_components)
+    def _render(self, pretty=False, nesting_level=0) -> str:
+        if pretty is MINIFIED:
+            # void elements don't need the slash, and it could be taken as part of an unquoted attribute value
+            if self._attributes:
+                return f"{self._start_tag_prefix}{_render_minified_attributes(self._attributes)}>"
+            return self._start_tag
+
+        if self._attributes:
+            tag = f"{self._start_tag_prefix}{_render_attributes(self._attributes)}/>"
+        else:
+            tag = self._self_closing_tag
+
+        if not pretty:
+            return tag
+        return f"{_indentation(pretty, nesting_level)}{tag}\n"
 
 
 class DOCTYPE(SelfClosingHtmlTag):
     """Defines the document type"""
+    __slots__ = ()
 
-    def _render(self, pretty=False, nesting_level=None) -> str:
+    def _render(self, pretty=False, nesting_level=0) -> str:
         separator = "\n" if pretty else ''
         return f"<!DOCTYPE html>{separator}"
 
 
+def build_many(tag_cls, items, attributes=tuple()) -> list:
+    """Returns one `tag_cls` tag for each element of `items`, containing that element (which can be anything accepted
+    as inner html, including lists). All the tags share the same `attributes`.
+
+    Attributes and elements are validated once for the whole batch, so this is faster than creating each tag
+    separately. Custom __init__ methods of `tag_cls` are not called.
+    """
+    attributes = tuple(attributes)
+    tag_cls.validate_attributes(attributes)
+    contents = [
+        [item] if isinstance(item, (str, HtmlTag, Text)) else flatten_params([item])
+        for item in items
+    ]
+    tag_cls.validate_inner_html(chain.from_iterable(contents))
+    if issubclass(tag_cls, SelfClosingHtmlTag) and any(contents):
+        raise NestingError(f"SelfClosingHtmlTag {tag_cls._name} must not have inner html")
+
+    build = tag_cls._build
+    return [build(attributes, content) for content in contents]
+
+
+def _cell_content(value):
+    return [value if isinstance(value, (str, HtmlTag, Text)) else str(value)]
+
+
 class A(HtmlTag):
     """Defines a hyperlink"""
-    pass
+    __slots__ = ()
 
 
 class Abbr(HtmlTag):
     """Defines an abbreviation or an acronym"""
-    pass
+    __slots__ = ()
 
 
 class Acronym(HtmlTag):
     """Not supported in HTML5. Use <abbr> instead."""
-    pass
+    __slots__ = ()
 
 
 class Address(HtmlTag):
     """Defines contact information for the author/owner of a document"""
-    pass
+    __slots__ = ()
 
 
 class Applet(HtmlTag):
     """Not supported in HTML5. Use <embed> or <object> instead."""
-    pass
+    __slots__ = ()
 
 
 class Area(SelfClosingHtmlTag):
     """Defines an area inside an image-map"""
-    pass
+    __slots__ = ()
 
 
 class Article(HtmlTag):
     """Defines an article"""
-    pass
+    __slots__ = ()
 
 
 class Aside(HtmlTag):
     """Defines content aside from the page content"""
-    pass
+    __slots__ = ()
 
 
 class Audio(HtmlTag):
     """Defines sound content"""
-    pass
+    __slots__ = ()
 
 
 class B(HtmlTag):
     """Defines bold text"""
-    pass
+    __slots__ = ()
 
 
 class Base(SelfClosingHtmlTag):
     """Specifies the base URL/target for all relative URLs in a document"""
-    pass
+    __slots__ = ()
 
 
 class Basefont(HtmlTag):
     """Not supported in HTML5. Use CSS instead."""
-    pass
+    __slots__ = ()
 
 
 class Bdi(HtmlTag):
     """Isolates a part of text that might be formatted in a different direction from other text outside it"""
-    pass
+    __slots__ = ()
 
 
 class Bdo(HtmlTag):
     """Overrides the current text direction"""
-    pass
+    __slots__ = ()
 
 
 class Big(HtmlTag):
     """Not supported in HTML5. Use CSS instead."""
-    pass
+    __slots__ = ()
 
 
 class Blockquote(HtmlTag):
     """Defines a section that is quoted from another source"""
-    pass
+    __slots__ = ()
 
 
 class Body(HtmlTag):
     """Defines the document's body"""
-    pass
+    __slots__ = ()
 
 
 class Br(SelfClosingHtmlTag):
     """Defines a single line break"""
-    pass
+    __slots__ = ()
 
 
 class Button(HtmlTag):
     """Defines a clickable button"""
-    pass
+    __slots__ = ()
 
 
 class Canvas(HtmlTag):
     """Used to draw graphics, on the fly, via scripting (usually JavaScript)"""
-    pass
+    __slots__ = ()
 
 
 class Caption(HtmlTag):
     """Defines a table caption"""
-    pass
+    __slots__ = ()
 
 
 class Center(HtmlTag):
     """Not supported in HTML5. Use CSS instead."""
-    pass
+    __slots__ = ()
 
 
 class Cite(HtmlTag):
     """Defines the title of a work"""
-    pass
+    __slots__ = ()
 
 
 class Code(HtmlTag):
     """Defines a piece of computer code"""
-    pass
+    __slots__ = ()
 
 
 class Col(SelfClosingHtmlTag):
     """Specifies column properties for each column within a <colgroup> element """
-    pass
+    __slots__ = ()
 
 
 class Colgroup(HtmlTag):
     """Specifies a group of one or more columns in a table for formatting"""
-    pass
+    __slots__ = ()
 
 
 class Datalist(HtmlTag):
     """Specifies a list of pre-defined options for input controls"""
-    pass
+    __slots__ = ()
 
 
 class Dd(HtmlTag):
     """Defines a description/value of a term in a description list"""
-    pass
+    __slots__ = ()
 
 
 class Del(HtmlTag):
     """Defines text that has been deleted from a document"""
-    pass
+    __slots__ = ()
 
 
 class Details(HtmlTag):
     """Defines additional details that the user can view or hide"""
-    pass
+    __slots__ = ()
 
 
 class Dfn(HtmlTag):
     """Represents the defining instance of a term"""
-    pass
+    __slots__ = ()
 
 
 class Dialog(HtmlTag):
     """Defines a dialog box or window"""
-    pass
+    __slots__ = ()
 
 
 class Dir(HtmlTag):
     """Not supported in HTML5. Use <ul> instead."""
-    pass
+    __slots__ = ()
 
 
 class Efines(HtmlTag):
     """directory list"""
-    pass
+    __slots__ = ()
 
 
 class Div(HtmlTag):
     """Defines a section in a document"""
-    pass
+    __slots__ = ()
 
 
 class Dl(HtmlTag):
     """Defines a description list"""
-    pass
+    __slots__ = ()
 
 
 class Dt(HtmlTag):
     """Defines a term/name in a description list"""
-    pass
+    __slots__ = ()
 
 
 class Em(HtmlTag):
     """Defines emphasized text """
-    pass
+    __slots__ = ()
 
 
 class Embed(SelfClosingHtmlTag):
     """Defines a container for an external (non-HTML) application"""
-    pass
+    __slots__ = ()
 
 
 class Fieldset(HtmlTag):
     """Groups related elements in a form"""
-    pass
+    __slots__ = ()
 
 
 class Figcaption(HtmlTag):
     """Defines a caption for a <figure> element"""
-    pass
+    __slots__ = ()
 
 
 class Figure(HtmlTag):
     """Specifies self-contained content"""
-    pass
+    __slots__ = ()
 
 
 class Font(HtmlTag):
     """Not supported in HTML5. Use CSS instead."""
-    pass
+    __slots__ = ()
 
 
 class Footer(HtmlTag):
     """Defines a footer for a document or section"""
-    pass
+    __slots__ = ()
 
 
 class Form(HtmlTag):
     """Defines an HTML form for user input"""
-    pass
+    __slots__ = ()
 
 
 class Frame(HtmlTag):
     """Not supported in HTML5."""
-    pass
+    __slots__ = ()
 
 
 class Frameset(HtmlTag):
     """Not supported in HTML5."""
-    pass
+    __slots__ = ()
 
 
 class H1(HtmlTag):
     """HTML heading"""
-    pass
+    __slots__ = ()
 
 
 class H2(HtmlTag):
     """HTML heading"""
-    pass
+    __slots__ = ()
 
 
 class H3(HtmlTag):
     """HTML heading"""
-    pass
+    __slots__ = ()
 
 
 class H4(HtmlTag):
     """HTML heading"""
-    pass
+    __slots__ = ()
 
 
 class H5(HtmlTag):
     """HTML heading"""
-    pass
+    __slots__ = ()
 
 
 class H6(HtmlTag):
     """HTML heading"""
-    pass
+    __slots__ = ()
 
 
 class Head(HtmlTag):
     """Defines information about the document"""
-    pass
+    __slots__ = ()
 
 
 class Header(HtmlTag):
     """Defines a header for a document or section"""
-    pass
+    __slots__ = ()
 
 
 class Hr(SelfClosingHtmlTag):
     """Defines a thematic change in the content"""
-    pass
+    __slots__ = ()
 
 
 class Html(HtmlTag):
     """Defines the root of an HTML document"""
-    pass
+    __slots__ = ()
 
 
 class I(HtmlTag):
     """Defines a part of text in an alternate voice or mood"""
-    pass
+    __slots__ = ()
 
 
 class Iframe(HtmlTag):
     """Defines an inline frame"""
-    pass
+    __slots__ = ()
 
 
 class Img(SelfClosingHtmlTag):
     """Defines an image"""
-    pass
+    __slots__ = ()
 
 
 class Input(SelfClosingHtmlTag):
     """Defines an input control"""
-    pass
+    __slots__ = ()
 
 
 class Ins(HtmlTag):
     """Defines a text that has been inserted into a document"""
-    pass
+    __slots__ = ()
 
 
 class Kbd(HtmlTag):
     """Defines keyboard input"""
-    pass
+    __slots__ = ()
 
 
 class Keygen(HtmlTag):
     """Defines a key-pair generator field (for forms)"""
-    pass
+    __slots__ = ()
 
 
 class Label(HtmlTag):
     """Defines a label for an <input> element"""
-    pass
+    __slots__ = ()
 
 
 class Legend(HtmlTag):
     """Defines a caption for a <fieldset> element"""
-    pass
+    __slots__ = ()
 
 
 class Li(HtmlTag):
     """Defines a list item"""
-    pass
+    __slots__ = ()
+    _omit_end_tag_before = frozenset(['li'])
 
 
 class Link(SelfClosingHtmlTag):
     """Defines the relationship between a document and an external resource (most used to link to style sheets)"""
-    pass
+    __slots__ = ()
 
 
 class Main(HtmlTag):
     """Specifies the main content of a document"""
-    pass
+    __slots__ = ()
 
 
 class Map(HtmlTag):
     """Defines a client-side image-map"""
-    pass
+    __slots__ = ()
 
 
 class Mark(HtmlTag):
     """Defines marked/highlighted text"""
-    pass
+    __slots__ = ()
 
 
 class Menu(HtmlTag):
     """Defines a list/menu of commands"""
-    pass
+    __slots__ = ()
 
 
 class Menuitem(HtmlTag):
     """Defines a command/menu item that the user can invoke from a popup menu"""
-    pass
+    __slots__ = ()
 
 
 class Meta(SelfClosingHtmlTag):
     """Defines metadata about an HTML document"""
-    pass
+    __slots__ = ()
 
 
 class Meter(HtmlTag):
     """Defines a scalar measurement within a known range (a gauge)"""
-    pass
+    __slots__ = ()
 
 
 class Nav(HtmlTag):
     """Defines navigation links"""
-    pass
+    __slots__ = ()
 
 
 class Noframes(HtmlTag):
     """Not supported in HTML5."""
-    pass
+    __slots__ = ()
 
 
 class Noscript(HtmlTag):
     """Defines an alternate content for users that do not support client-side scripts"""
-    pass
+    __slots__ = ()
 
 
 class Object(HtmlTag):
     """Defines an embedded object"""
-    pass
+    __slots__ = ()
 
 
 class Ol(HtmlTag):
     """Defines an ordered list"""
-    pass
+    __slots__ = ()
 
 
 class Optgroup(HtmlTag):
     """Defines a group of related options in a drop-down list"""
-    pass
+    __slots__ = ()
 
 
 class Option(HtmlTag):
     """Defines an option in a drop-down list"""
-    pass
+    __slots__ = ()
+    _omit_end_tag_before = frozenset(['option', 'optgroup'])
 
 
 class Output(HtmlTag):
     """Defines the result of a calculation"""
-    pass
+    __slots__ = ()
 
 
 class P(HtmlTag):
     """Defines a paragraph"""
-    pass
+    __slots__ = ()
+    _omit_end_tag_before = frozenset([
+        'address', 'article', 'aside', 'blockquote', 'details', 'div', 'dl', 'fieldset', 'figcaption', 'figure',
+        'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'main', 'menu', 'nav', 'ol',
+        'p', 'pre', 'section', 'table', 'ul',
+    ])
+    _keep_end_tag_in = frozenset(['a', 'audio', 'del', 'ins', 'map', 'noscript', 'video'])
 
 
 class Param(SelfClosingHtmlTag):
     """Defines a parameter for an object"""
-    pass
+    __slots__ = ()
 
 
 class Picture(HtmlTag):
     """Defines a container for multiple image resources"""
-    pass
+    __slots__ = ()
 
 
 class Pre(HtmlTag):
     """Defines preformatted text"""
-    pass
+    __slots__ = ()
+    _preserve_whitespace = True
 
 
 class Progress(HtmlTag):
     """Represents the progress of a task"""
-    pass
+    __slots__ = ()
 
 
 class Q(HtmlTag):
     """Defines a short quotation"""
-    pass
+    __slots__ = ()
 
 
 class Rp(HtmlTag):
     """Defines what to show in browsers that do not support ruby annotations"""
-    pass
+    __slots__ = ()
 
 
 class Rt(HtmlTag):
     """Defines an explanation/pronunciation of characters (for East Asian typography)"""
-    pass
+    __slots__ = ()
 
 
 class Ruby(HtmlTag):
     """Defines a ruby annotation (for East Asian typography)"""
-    pass
+    __slots__ = ()
 
 
 class S(HtmlTag):
     """Defines text that is no longer correct"""
-    pass
+    __slots__ = ()
 
 
 class Samp(HtmlTag):
     """Defines sample output from a computer program"""
-    pass
+    __slots__ = ()
 
 
 class Script(HtmlTag):
     """Defines a client-side script"""
-    pass
+    __slots__ = ()
+    _raw_text = True
+    _preserve_whitespace = True
 
 
 class Section(HtmlTag):
     """Defines a section in a document"""
-    pass
+    __slots__ = ()
 
 
 class Select(HtmlTag):
     """Defines a drop-down list"""
-    pass
+    __slots__ = ()
 
 
 class Small(HtmlTag):
     """Defines smaller text"""
-    pass
+    __slots__ = ()
 
 
 class Source(HtmlTag):
     """Defines multiple media resources for media elements (<video> and <audio>)"""
-    pass
+    __slots__ = ()
 
 
 class Span(HtmlTag):
     """Defines a section in a document"""
-    pass
+    __slots__ = ()
 
 
 class Strike(HtmlTag):
     """Not supported in HTML5. Use <del> or <s> instead."""
-    pass
+    __slots__ = ()
 
 
 class Strong(HtmlTag):
     """Defines important text"""
-    pass
+    __slots__ = ()
 
 
 class Style(HtmlTag):
     """Defines style information for a document"""
-    pass
+    __slots__ = ()
+    _raw_text = True
+    _preserve_whitespace = True
 
 
 class Sub(HtmlTag):
     """Defines subscripted text"""
-    pass
+    __slots__ = ()
 
 
 class Summary(HtmlTag):
     """Defines a visible heading for a <details> element"""
-    pass
+    __slots__ = ()
 
 
 class Sup(HtmlTag):
     """Defines superscripted text"""
-    pass
+    __slots__ = ()
 
 
 class Table(HtmlTag):
     """Defines a table"""
-    pass
+    __slots__ = ()
+
+    @classmethod
+    def from_rows(cls, rows, attributes=tuple(), row_attributes=tuple(), cell_attributes=tuple(), header=None):
+        """Builds a table with a Tr for each row of `rows` and a Td for each value of a row. Values that are not tags
+        are converted to strings. When `header` is given, a first row with a Th for each of its values is added.
+
+        Rows can be any iterable of iterables (lists, generators, 2D NumPy arrays...). The result is the same tree as
+        creating each tag separately, but attributes are validated only once and cells skip validation.
+        """
+        attributes, row_attributes, cell_attributes = tuple(attributes), tuple(row_attributes), tuple(cell_attributes)
+        cls.validate_attributes(attributes)
+        Tr.validate_attributes(row_attributes)
+        Td.validate_attributes(cell_attributes)
+
+        build_row, build_cell = Tr._build, Td._build
+        table_rows = []
+        if header is not None:
+            table_rows.append(build_row(row_attributes, [Th._build((), _cell_content(value)) for value in header]))
+        for row in rows:
+            table_rows.append(build_row(row_attributes, [build_cell(cell_attributes, _cell_content(value)) for value in row]))
+        return cls._build(attributes, table_rows)
+
+    @classmethod
+    def from_columns(cls, columns, **kwargs):
+        """Same as from_rows(), taking a sequence of columns (lists, NumPy arrays...) instead of rows"""
+        return cls.from_rows(zip(*columns), **kwargs)
 
 
 class Tbody(HtmlTag):
     """Groups the body content in a table"""
-    pass
+    __slots__ = ()
 
 
 class Td(HtmlTag):
     """Defines a cell in a table"""
-    pass
+    __slots__ = ()
+    _omit_end_tag_before = frozenset(['td', 'th'])
 
 
 class Textarea(HtmlTag):
     """Defines a multiline input control (text area)"""
-    pass
+    __slots__ = ()
+    _preserve_whitespace = True
 
 
 class Tfoot(HtmlTag):
     """Groups the footer content in a table"""
-    pass
+    __slots__ = ()
 
 
 class Th(HtmlTag):
     """Defines a header cell in a table"""
-    pass
+    __slots__ = ()
+    _omit_end_tag_before = frozenset(['td', 'th'])
 
 
 class Thead(HtmlTag):
     """Groups the header content in a table"""
-    pass
+    __slots__ = ()
 
 
 class Time(HtmlTag):
     """Defines a date/time"""
-    pass
+    __slots__ = ()
 
 
 class Title(HtmlTag):
     """Defines a title for the document"""
-    pass
+    __slots__ = ()
 
 
 class Tr(HtmlTag):
     """Defines a row in a table"""
-    pass
+    __slots__ = ()
+    _omit_end_tag_before = frozenset(['tr'])
 
 
 class Track(HtmlTag):
     """Defines text tracks for media elements (<video> and <audio>)"""
-    pass
+    __slots__ = ()
 
 
 class Tt(HtmlTag):
     """Not supported in HTML5. Use CSS instead."""
-    pass
+    __slots__ = ()
 
 
 class U(HtmlTag):
     """Defines text that should be stylistically different from normal text"""
-    pass
+    __slots__ = ()
 
 
 class Ul(HtmlTag):
     """Defines an unordered list"""
-    pass
+    __slots__ = ()
 
 
 class Var(HtmlTag):
     """Defines a variable"""
-    pass
+    __slots__ = ()
 
 
 class Video(HtmlTag):
     """Defines a video or movie"""
-    pass
+    __slots__ = ()
 
 
 class Wbr(HtmlTag):
     """Defines a possible line-break"""
-    pass
+    __slots__ = ()
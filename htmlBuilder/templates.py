@@ -0,0 +1,103 @@
+from htmlBuilder.exceptions import HtmlBuildError
+from .tags import HtmlTag, Text, Lazy, DOCTYPE, _iter_chunks, _indentation
+from .utils import flatten_params, escape, Markup
+
+
+class _Slot(str):
+    """Rendered placeholder, carries the information needed to fill it later"""
+
+    def __new__(cls, value, placeholder, pretty, nesting_level):
+        slot = super().__new__(cls, value)
+        slot.placeholder = placeholder
+        slot.pretty = pretty
+        slot.nesting_level = nesting_level
+        slot.raw_text = placeholder.raw_text
+        return slot
+
+
+class Placeholder(Text):
+    """A named slot of a tag tree that receives its content when rendering a compiled Template.
+
+    When the tree is rendered directly the placeholder renders its `default` content. Like any other text, its
+    content is not escaped inside raw text elements (like scripts).
+    """
+    __slots__ = ('name', 'raw_text')
+
+    def __init__(self, name, default=''):
+        super().__init__(default)
+        self.name = name
+        self.raw_text = False
+
+    def _in_raw_text(self):
+        if self.raw_text:
+            return self
+        placeholder = Placeholder(self.name, Markup(self.text))
+        placeholder.raw_text = True
+        return placeholder
+
+    def _render_parts(self, pretty, nesting_level):
+        return _Slot(self._render(pretty, nesting_level), self, pretty, nesting_level), (), ''
+
+
+class Template:
+    """Pre-rendered tag tree with Placeholders, rendering it only fills the placeholders between static html"""
+
+    def __init__(self, segments, slots):
+        self._segments = segments
+        self._slots = slots
+
+    @property
+    def placeholders(self):
+        return tuple(dict.fromkeys(name for _, name, _, _, _ in self._slots))
+
+    def render(self, **values) -> str:
+        result = self._segments.copy()
+        for index, name, prefix, suffix, slot in self._slots:
+            value = values.get(name, slot)
+            if value is slot:
+                continue
+            if value.__class__ is str:
+                result[index] = prefix + (value if slot.raw_text else escape(value)) + suffix
+            else:
+                result[index] = _render_value(value, slot.pretty, slot.nesting_level, slot.raw_text)
+        return "".join(result)
+
+
+def _render_value(value, pretty, nesting_level, raw_text=False) -> str:
+    if isinstance(value, str):
+        return Text(Markup(value) if raw_text else value)._render(pretty, nesting_level)
+    if isinstance(value, (HtmlTag, Text, Lazy)):
+        return value._render(pretty, nesting_level)
+
+    items = flatten_params([value])
+    HtmlTag.validate_inner_html(items)
+    return "".join(_render_value(item, pretty, nesting_level, raw_text) for item in items)
+
+
+def compile(tag: HtmlTag, pretty=False, doctype=False) -> Template:
+    """Renders `tag` once and returns a Template whose render(**values) fills its Placeholders by name.
+
+    Values can be anything accepted as inner html: strings, tags or lists of them. Placeholders inside frozen tags
+    are part of their cached html, so they always render their default content.
+    """
+    if not isinstance(tag, HtmlTag):
+        raise HtmlBuildError(f"Only HtmlTag instances can be compiled, [{tag}->{tag.__class__.__name__}] found")
+
+    segments = []
+    slots = []
+    static = [DOCTYPE()._render(pretty=pretty)] if doctype else []
+    # html cached by renders with cache=True doesn't have the placeholder slots, it is only reused for frozen tags
+    for chunk in _iter_chunks(tag, pretty=pretty, nesting_level=0, cache=None):
+        if isinstance(chunk, _Slot):
+            segments.append("".join(static))
+            if chunk.pretty:
+                prefix, suffix = _indentation(chunk.pretty, chunk.nesting_level), "\n"
+            else:
+                prefix, suffix = '', ''
+            slots.append((len(segments), chunk.placeholder.name, prefix, suffix, chunk))
+            segments.append(chunk)
+            static = []
+        else:
+            static.append(chunk)
+    segments.append("".join(static))
+    return Template(segments, slots)
@@ -1,9 +1,53 @@
+import asyncio
+import bz2
+import gc
+import gzip
+import io
+import pickle
 import unittest
+import zlib
+from unittest import mock
 
-from htmlBuilder.exceptions import HtmlBuildError, InvalidAttributeError, NestingError
-from htmlBuilder.tags import HtmlTag, SelfClosingHtmlTag, DOCTYPE, Div, A, Text, Html
-from htmlBuilder.utils import flatten_params
-from htmlBuilder.attributes import HtmlTagAttribute, Data_, Style as InlineStyle
+from htmlBuilder.exceptions import HtmlBuildError, InvalidAttributeError, NestingError, FrozenTagError
+from htmlBuilder.tags import (
+    HtmlTag, SelfClosingHtmlTag, DOCTYPE, Div, A, Text, Html, Head, Title, Body, Nav, Footer, Ul, Li, Hr, Span, Script,
+    Table, Tr, Td, Th, P, Pre, Img, Br, Select, Option, Lazy, build_many, trusted_mode, render_cache_info, reset_render_cache_info,
+)
+from htmlBuilder.utils import flatten_params, escape, Markup
+from htmlBuilder.templates import Placeholder, compile as compile_template
+from htmlBuilder import parallel, compression, fragments
+from htmlBuilder.streaming import HtmlStream
+from htmlBuilder.components import component
+from htmlBuilder.profiling import Profiler
+from htmlBuilder.formatting import Formatter, INLINE_TAGS
+from htmlBuilder import tags as tags_module
+from htmlBuilder.attributes import HtmlTagAttribute, Class, Data_, Id, Href, Src, Style as InlineStyle
+
+
+def build_sample_page():
+    users = [
+        {"name": "Jose", "movies": ['A beautiful mind', 'Red'], "favorite-number": 42},
+        {"name": "Jaime", "movies": ['The breakfast club', 'Fight club'], "favorite-number": 7},
+        {"name": "Jhon", "movies": ['The room', 'Yes man'], "favorite-number": 987654321},
+    ]
+    return Html([],
+        Head([],
+            Title([], "An awesome site")
+        ),
+        Body([InlineStyle(background_color='red', bottom='35px')],
+            Nav([Class("nav pretty")],
+                Div([], "A beautiful NavBar"),
+                Hr(),
+            ),
+            [Div([Class(f"user-{user['name'].lower()}")],
+                Div([], user['name']),
+                Ul([],
+                    [Li([], movie) for movie in user["movies"]]
+                ) if user['favorite-number'] < 100 else "Favorite number is too high"
+            ) for user in users],
+            Footer([], "My Footer"),
+        )
+    )
 
 
 class TestFlattenMethod(unittest.TestCase):
@@ -19,6 +63,16 @@ class TestFlattenMethod(unittest.TestCase):
     def test_flatten_generators(self):
         self.assertEqual(flatten_params([1, [[2, [3]], 4], (i for i in range(5))]), [1, 2, 3, 4, 0, 1, 2, 3, 4])
 
+    def test_strings_and_tags_are_not_flattened(self):
+        div = Div()
+        self.assertEqual(flatten_params(["ab", ("cd", [div]), {"ef"}]), ["ab", "cd", div, "ef"])
+
+    def test_flatten_deeply_nested_lists(self):
+        params = [1]
+        for i in range(10000):
+            params = [params, i]
+        self.assertEqual(flatten_params(params), [1] + list(range(10000)))
+
 
 class TestTagObjectCreation(unittest.TestCase):
 
@@ -126,6 +180,33 @@ class TestTagRendering(unittest.TestCase):
             current_element = inner_div
 
 
+    def test_custom_element_names(self):
+        class Widget(Div):
+            _name = "my-widget"
+
+        class Renamed(Div):
+            def __init__(self, *args):
+                super().__init__(*args)
+                self._name = "x-renamed"
+
+        class Icon(Br):
+            _name = "x-icon"
+
+        for tag in (Widget([Class("a")], "x"), Renamed([Class("a")], "x")):
+            self.assertEqual(tag.render(), f"<{tag.name} class='a'>x</{tag.name}>")
+            self.assertEqual(tag.render(minify=True), f"<{tag.name} class=a>x</{tag.name}>")
+            self.assertEqual(tag.stats().compact_size, len(tag.render()))
+        self.assertEqual(Widget.trusted([], "x").render(), "<my-widget>x</my-widget>")
+        self.assertEqual(Icon().render(), "<x-icon/>")
+        # trusted() doesn't call __init__, so the tag keeps the class name
+        self.assertEqual(Renamed.trusted([], "x").render(), "<renamed>x</renamed>")
+        self.assertNotEqual(Renamed([], "x").structural_hash(), Renamed.trusted([], "x").structural_hash())
+
+        tag = Renamed([], "x")
+        self.assertEqual(Div([], tag).render(cache=True), "<div><x-renamed>x</x-renamed></div>")
+        tag._name = "x-other"
+        self.assertEqual(Div([], tag).render(), "<div><x-other>x</x-other></div>")
+
 
 class TestTagAttributeRendering(unittest.TestCase):
     def setUp(self):
@@ -164,3 +245,1124 @@ class TestTagAttributeRendering(unittest.TestCase):
             HtmlTag(["invalid_attribute"])
         with self.assertRaises(HtmlBuildError):
             HtmlTag([HtmlTag])
+
+
+class TestStreamingRender(unittest.TestCase):
+    def test_iter_render_matches_render(self):
+        page = build_sample_page()
+        for pretty in (False, True):
+            for doctype in (False, True):
+                self.assertEqual(
+                    "".join(page.iter_render(pretty=pretty, doctype=doctype)),
+                    page.render(pretty=pretty, doctype=doctype),
+                )
+
+    def test_iter_render_yields_multiple_fragments(self):
+        chunks = list(Div([], Div(), "text").iter_render())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(chunks[0], "<div>")
+
+
+class TestRenderTo(unittest.TestCase):
+    def setUp(self):
+        self.page = build_sample_page()
+        self.expected = self.page.render(pretty=True, doctype=True)
+
+    def test_render_to_text_stream(self):
+        fp = io.StringIO()
+        written = self.page.render_to(fp, pretty=True, doctype=True, buffer_size=16)
+        self.assertEqual(fp.getvalue(), self.expected)
+        self.assertEqual(written, len(self.expected))
+
+    def test_render_to_binary_stream(self):
+        fp = io.BytesIO()
+        Div([], "caf\u00e9").render_to(fp, encoding='latin-1')
+        self.assertEqual(fp.getvalue(), "<div>caf\u00e9</div>".encode('latin-1'))
+
+        fp = io.BytesIO()
+        self.page.render_to(fp, pretty=True, doctype=True)
+        self.assertEqual(fp.getvalue(), self.expected.encode('utf-8'))
+
+    def test_render_to_bytearray(self):
+        buffer = bytearray()
+        self.page.render_to(buffer, pretty=True, doctype=True, buffer_size=1)
+        self.assertEqual(buffer.decode('utf-8'), self.expected)
+
+    def test_render_to_self_closing_tags(self):
+        fp = io.StringIO()
+        Hr().render_to(fp, doctype=True)
+        self.assertEqual(fp.getvalue(), "<!DOCTYPE html><hr/>")
+
+
+class TestDeepTreeRendering(unittest.TestCase):
+    def test_render_10000_levels_deep_tree(self):
+        depth = 10000
+        root = Div()
+        for _ in range(depth - 1):
+            root = Div([], root)
+
+        self.assertEqual(root.render(), "<div>" * depth + "</div>" * depth)
+        self.assertEqual(sum(len(chunk) for chunk in root.iter_render()), len("<div></div>") * depth)
+
+    def test_pretty_render_deep_tree(self):
+        depth = 1500
+        root = Div([], "text")
+        for _ in range(depth - 1):
+            root = Div([], root)
+
+        lines = root.render(pretty=True).splitlines()
+        self.assertEqual(len(lines), 2 * depth + 1)
+        self.assertEqual(lines[depth], "  " * depth + "text")
+
+    def test_render_without_nesting_level(self):
+        self.assertEqual(Div([], "x")._render(), "<div>x</div>")
+        self.assertEqual(Div([], "x")._render(True), "<div>\n  x\n</div>\n")
+        self.assertEqual(Text("x")._render(True), "x\n")
+
+    def test_custom_render_method_is_used_for_nested_tags(self):
+        class Comment(Div):
+            def _render(self, pretty=False, nesting_level=None):
+                return "<!-- comment -->"
+
+        self.assertEqual(Div([], Comment()).render(), "<div><!-- comment --></div>")
+
+        class Fancy(Div):
+            def _render(self, pretty=False, nesting_level=0):
+                return "<!--x-->" + super()._render(pretty, nesting_level)
+
+        self.assertEqual(Div([], Fancy([], "a", Comment())).render(), "<div><!--x--><fancy>a<!-- comment --></fancy></div>")
+        self.assertEqual(
+            Fancy([], Span([], "a")).render(pretty=True), "<!--x--><fancy>\n  <span>\n    a\n  </span>\n</fancy>\n"
+        )
+
+
+class TestFrozenTags(unittest.TestCase):
+    def test_frozen_tag_renders_like_a_regular_tag(self):
+        page = build_sample_page()
+        expected = {(pretty, doctype): page.render(pretty=pretty, doctype=doctype)
+                    for pretty in (False, True) for doctype in (False, True)}
+        page.inner_html[1].inner_html[0].freeze()
+        for _ in range(2):
+            for (pretty, doctype), html in expected.items():
+                self.assertEqual(page.render(pretty=pretty, doctype=doctype), html)
+
+    def test_frozen_fragment_is_reused(self):
+        nav = Nav([], Div([], "A beautiful NavBar")).freeze()
+        Div([], nav).render()
+        nav._inner_html[0]._inner_html[0].text = "Changed"
+        self.assertEqual(Body([], nav).render(), "<body><nav><div>A beautiful NavBar</div></nav></body>")
+
+    def test_only_frozen_tags_are_cached(self):
+        sibling = Div([], "not frozen")
+        Body([], Nav([], "text").freeze(), sibling).render()
+        self.assertIsNone(sibling._render_cache)
+
+    def test_frozen_fragment_is_indented_for_each_nesting_level(self):
+        nav = Nav([], "text").freeze()
+        self.assertEqual(Div([], nav).render(pretty=True), "<div>\n  <nav>\n    text\n  </nav>\n</div>\n")
+        self.assertEqual(nav.render(pretty=True), "<nav>\n  text\n</nav>\n")
+
+    def test_frozen_tags_cant_be_modified(self):
+        inner = Div()
+        nav = Nav([], inner).freeze()
+        self.assertTrue(inner.frozen)
+        with self.assertRaises(FrozenTagError):
+            nav.inner_html = [Div()]
+        with self.assertRaises(FrozenTagError):
+            inner.inner_html = ["text"]
+        with self.assertRaises(FrozenTagError):
+            nav.attributes = [Class("nav")]
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        reset_render_cache_info()
+
+    def test_cached_render_matches_render(self):
+        page = build_sample_page()
+        for pretty in (False, True):
+            for _ in range(2):
+                self.assertEqual(page.render(pretty=pretty, cache=True), build_sample_page().render(pretty=pretty))
+
+    def test_second_render_is_served_from_cache(self):
+        page = build_sample_page()
+        page.render(cache=True)
+        self.assertEqual(render_cache_info().hits, 0)
+        misses = render_cache_info().misses
+        page.render(cache=True)
+        self.assertEqual(render_cache_info(), (1, misses))
+
+    def test_modified_tags_and_their_ancestors_are_rendered_again(self):
+        counter = Span([], "1")
+        sibling = Div([], "sibling")
+        page = Html([], Body([], Div([], counter), sibling))
+        page.render(cache=True)
+
+        reset_render_cache_info()
+        counter.inner_html = ["2"]
+        self.assertEqual(
+            page.render(cache=True),
+            "<html><body><div><span>2</span></div><div>sibling</div></body></html>"
+        )
+        # html, body, div and span are rendered again, the sibling div is reused
+        self.assertEqual(render_cache_info(), (1, 4))
+
+        counter.attributes = [Class("badge")]
+        self.assertEqual(page.render(cache=True), "<html><body><div><span class='badge'>2</span></div><div>sibling</div></body></html>")
+
+    def test_uncached_renders_dont_cache_tags_after_a_frozen_one(self):
+        body = Body([], Div([], "sibling"))
+        page = Html([], Head([], Title([], "title")).freeze(), body)
+        page.render()
+        body.inner_html.append(P([], "new"))
+        self.assertEqual(
+            page.render(), "<html><head><title>title</title></head><body><div>sibling</div><p>new</p></body></html>"
+        )
+
+    def test_replaced_children_dont_invalidate_old_parents(self):
+        child = Div()
+        parent = Div([], child)
+        parent.inner_html = ["text"]
+        parent.render(cache=True)
+        child.inner_html = ["changed"]
+        self.assertIsNotNone(parent._render_cache)
+
+    def test_shared_tags_invalidate_every_parent(self):
+        shared = Span([], "a")
+        first, second = Div([], shared), Div([], shared)
+        first.render(cache=True)
+        second.render(cache=True)
+        shared.inner_html = ["b"]
+        self.assertEqual(first.render(cache=True), "<div><span>b</span></div>")
+        self.assertEqual(second.render(cache=True), "<div><span>b</span></div>")
+
+    def test_children_included_twice_can_be_replaced(self):
+        child = Span([], "x")
+        parent = Div([], child, child)
+        parent.inner_html = ["y"]
+        self.assertIsNone(child._parents)
+        shared_parent = Div([], child)
+        parent.inner_html = [child, child]
+        parent.inner_html = []
+        self.assertEqual(tags_module._live_parents(child), [shared_parent])
+
+    def test_collected_parents_are_forgotten(self):
+        nav = Nav([], Div([], "A beautiful NavBar")).freeze()
+        for _ in range(100):
+            Div([], nav).render()
+        page = Body([], nav)
+        gc.collect()
+        self.assertEqual(tags_module._live_parents(nav), [page])
+        self.assertIs(nav._parents(), page)
+        del page
+        gc.collect()
+        self.assertIsNone(nav._parents)
+
+
+class TestTemplates(unittest.TestCase):
+    @staticmethod
+    def build_page(title, name, movies):
+        return Html([],
+            Head([], Title([], title)),
+            Body([],
+                Nav([Class("nav pretty")], Div([], "A beautiful NavBar")),
+                Div([Class("user")], Div([], name), Ul([], movies)),
+                Footer([], "My Footer"),
+            )
+        )
+
+    def test_template_render_matches_tree_render(self):
+        movies = [Li([], "A beautiful mind"), Li([], "Red")]
+        for pretty in (False, True):
+            template = compile_template(
+                self.build_page(Placeholder('title'), Placeholder('name'), Placeholder('movies')),
+                pretty=pretty, doctype=True,
+            )
+            self.assertEqual(
+                template.render(title="An awesome site", name="Jose", movies=movies),
+                self.build_page("An awesome site", "Jose", movies).render(pretty=pretty, doctype=True),
+            )
+
+    def test_missing_values_render_the_default_content(self):
+        template = compile_template(Div([], Placeholder('content', default="empty")))
+        self.assertEqual(template.render(), "<div>empty</div>")
+        self.assertEqual(Div([], Placeholder('content', default="empty")).render(), "<div>empty</div>")
+        self.assertEqual(template.placeholders, ('content',))
+
+    def test_placeholder_can_be_used_several_times(self):
+        template = compile_template(Div([], Placeholder('x'), Span([], Placeholder('x'))))
+        self.assertEqual(template.render(x="1"), "<div>1<span>1</span></div>")
+
+    def test_trees_rendered_with_cache_can_be_compiled(self):
+        page = Div([], Nav([], "static").freeze(), P([], Span([], Placeholder('name', default="nobody"))))
+        for pretty in (False, True):
+            page.render(cache=True, pretty=pretty)
+            template = compile_template(page, pretty=pretty)
+            self.assertEqual(template.placeholders, ('name',))
+            self.assertEqual(
+                template.render(name="Bob"), Div([], Nav([], "static"), P([], Span([], "Bob"))).render(pretty=pretty)
+            )
+
+    def test_invalid_values_raise_error(self):
+        template = compile_template(Div([], Placeholder('content')))
+        with self.assertRaises(HtmlBuildError):
+            template.render(content=[Div, "text"])
+
+
+class TestLazyChildren(unittest.TestCase):
+    def test_lazy_children_are_consumed_while_rendering(self):
+        produced = []
+
+        def rows():
+            for i in range(1000):
+                produced.append(i)
+                yield Li([], str(i))
+
+        tag = Ul([], Lazy(rows()))
+        self.assertEqual(produced, [])
+
+        chunks = tag.iter_render()
+        first_chunks = [next(chunks) for _ in range(5)]
+        self.assertLess(len(produced), 5)
+
+        self.assertEqual(
+            "".join(first_chunks) + "".join(chunks),
+            "<ul>" + "".join(f"<li>{i}</li>" for i in range(1000)) + "</ul>"
+        )
+
+    def test_lazy_render_matches_eager_render(self):
+        def items():
+            yield "text"
+            yield [Div(), Div([], "nested")]
+            yield (Hr() for _ in range(2))
+
+        for pretty in (False, True):
+            self.assertEqual(
+                Body([], Nav(), Lazy(items()), Footer()).render(pretty=pretty),
+                Body([], Nav(), list(items()), Footer()).render(pretty=pretty),
+            )
+
+    def test_lazy_elements_are_validated_while_rendering(self):
+        tag = Ul([], Lazy([Li(), Li]))
+        with self.assertRaises(HtmlBuildError):
+            tag.render()
+
+
+class TestCompactNodes(unittest.TestCase):
+    def test_builtin_tags_and_attributes_have_no_instance_dict(self):
+        tags = [tag for tag in HtmlTag.__subclasses__() + SelfClosingHtmlTag.__subclasses__()]
+        for tag in tags:
+            self.assertFalse(hasattr(tag(), '__dict__'), tag)
+        for attribute in HtmlTagAttribute.__subclasses__():
+            instance = attribute("name", "value") if attribute is Data_ else attribute("value")
+            self.assertFalse(hasattr(instance, '__dict__'), attribute)
+        self.assertFalse(hasattr(Text("text"), '__dict__'))
+
+    def test_user_defined_tags_get_precomputed_tag_strings(self):
+        class MyWidget(Div):
+            pass
+
+        class MyIcon(Hr):
+            pass
+
+        self.assertEqual(MyWidget._start_tag, "<mywidget>")
+        self.assertEqual(MyWidget._end_tag, "</mywidget>")
+        self.assertEqual(MyWidget([], MyIcon([Class("icon")])).render(), "<mywidget><myicon class='icon'/></mywidget>")
+
+    def test_names_are_computed_per_class(self):
+        self.assertEqual(Div().name, "div")
+        self.assertEqual(Class("a").name, "class")
+        self.assertEqual(InlineStyle(color="red").name, "style")
+        self.assertEqual(Data_("test-value", "a").name, "data-test-value")
+        self.assertEqual(str(Data_("test-value", "a")), "data-test-value='a'")
+
+
+class TestEscaping(unittest.TestCase):
+    def test_text_is_escaped(self):
+        self.assertEqual(Div([], "<b>Tom & 'Jerry'</b>").render(), "<div>&lt;b&gt;Tom &amp; &#x27;Jerry&#x27;&lt;/b&gt;</div>")
+        self.assertEqual(Div([], "a < b").render(pretty=True), "<div>\n  a &lt; b\n</div>\n")
+
+    def test_attribute_values_are_escaped(self):
+        self.assertEqual(
+            Div([Class("x' onclick='alert(1)"), Data_("value", 1)]).render(),
+            "<div class='x&#x27; onclick=&#x27;alert(1)' data-value='1'></div>"
+        )
+
+    def test_markup_is_not_escaped(self):
+        self.assertEqual(Div([], Markup("<b>bold</b>")).render(), "<div><b>bold</b></div>")
+        self.assertEqual(Div([Class(Markup("a&amp;b"))]).render(), "<div class='a&amp;b'></div>")
+
+        class Html:
+            def __html__(self):
+                return "<i>html</i>"
+
+        self.assertEqual(escape(Html()), "<i>html</i>")
+
+    def test_script_content_is_not_escaped(self):
+        self.assertEqual(Script([], "if (a < b) {}").render(), "<script>if (a < b) {}</script>")
+
+    def test_escape_returns_strings_without_special_characters_unchanged(self):
+        value = "plain text " * 50
+        self.assertIs(escape(value), value)
+        self.assertEqual(escape("&" * 500), "&amp;" * 500)
+        self.assertEqual(escape(42), "42")
+
+    def test_template_values_are_escaped(self):
+        template = compile_template(Div([], Placeholder('content')), pretty=True)
+        self.assertEqual(template.render(content="<b>"), "<div>\n  &lt;b&gt;\n</div>\n")
+        self.assertEqual(template.render(content=Markup("<b>")), "<div>\n  <b>\n</div>\n")
+
+    def test_template_values_in_scripts_are_not_escaped(self):
+        tree = Div([], Script([], Placeholder('code', default="if (a<b) {}")))
+        template = compile_template(tree)
+        self.assertEqual(template.render(), "<div><script>if (a<b) {}</script></div>")
+        self.assertEqual(template.render(), tree.render())
+        self.assertEqual(template.render(code="if (c<d) {}"), Div([], Script([], "if (c<d) {}")).render())
+        self.assertEqual(template.render(code=["a<b", "&"]), "<div><script>a<b&</script></div>")
+
+
+class TestBatchConstruction(unittest.TestCase):
+    def test_build_many_matches_manual_construction(self):
+        items = ["a", Span(), ["b", Text("c")]]
+        tags = build_many(Li, items, [Class("item")])
+        self.assertEqual(
+            Ul([], tags).render(),
+            Ul([], [Li([Class("item")], item) for item in items]).render(),
+        )
+        self.assertEqual(tags[2].inner_html[0].text, "b")
+
+    def test_build_many_validates_items(self):
+        with self.assertRaises(HtmlBuildError):
+            build_many(Li, ["a", Div])
+        with self.assertRaises(HtmlBuildError):
+            build_many(Li, ["a"], ["invalid_attribute"])
+        with self.assertRaises(NestingError):
+            build_many(Hr, ["a"])
+        self.assertEqual(len(build_many(Hr, [[], []])), 2)
+
+    def test_table_from_rows_matches_manual_construction(self):
+        rows = [(1, "a & b", 2.5), (2, A([], "link"), None)]
+        expected = Table([Class("report")],
+            Tr([], [Th([], str(value)) for value in ("id", "name", "value")]),
+            [Tr([], [Td([], value if isinstance(value, HtmlTag) else str(value)) for value in row]) for row in rows],
+        )
+        table = Table.from_rows(rows, attributes=[Class("report")], header=("id", "name", "value"))
+        self.assertEqual(table.render(pretty=True), expected.render(pretty=True))
+        self.assertEqual(Table.from_rows(iter(rows)).render(), Table.from_columns(zip(*rows)).render())
+
+    def test_batch_built_tags_track_their_parents(self):
+        table = Table.from_rows([["a"]])
+        table.render(cache=True)
+        table.inner_html[0].inner_html[0].inner_html = ["b"]
+        self.assertEqual(table.render(cache=True), "<table><tr><td>b</td></tr></table>")
+
+
+class TestTrustedConstruction(unittest.TestCase):
+    def test_trusted_mode_skips_validation(self):
+        with trusted_mode():
+            tag = Div(["not validated"], Div())
+            tag.inner_html = [Div(), "text"]
+        self.assertEqual(tag.attributes, ["not validated"])
+        self.assertEqual(tag.inner_html[1].text, "text")
+        with self.assertRaises(HtmlBuildError):
+            Div(["validated again"])
+
+    def test_trusted_mode_is_restored_after_errors(self):
+        with self.assertRaises(ZeroDivisionError):
+            with trusted_mode():
+                1 / 0
+        with self.assertRaises(HtmlBuildError):
+            Div([], Div)
+
+    def test_trusted_constructor_builds_the_same_tree(self):
+        trusted = Div.trusted([Class("a")], "text", [Span([], "b"), Hr()])
+        self.assertEqual(trusted.render(), Div([Class("a")], "text", [Span([], "b"), Hr()]).render())
+        self.assertEqual(Div.trusted().render(), "<div></div>")
+
+
+class TestParallelRendering(unittest.TestCase):
+    def setUp(self):
+        self.page = Html([],
+            Head([], Title([], "Dashboard")),
+            Body([], [
+                Div([Class(f"section-{i}")], [Div([], f"item {i}-{j}", Span([], "&")) for j in range(10)], "text")
+                for i in range(12)
+            ]),
+        )
+
+    def test_tags_can_be_pickled(self):
+        page = build_sample_page()
+        unpickled = pickle.loads(pickle.dumps(page))
+        self.assertEqual(unpickled.render(pretty=True), page.render(pretty=True))
+        self.assertEqual(unpickled.structural_hash(), page.structural_hash())
+        fragments.enable(min_nodes=1)
+        try:
+            self.assertEqual(pickle.loads(pickle.dumps(page)).render(), page.render())
+        finally:
+            fragments.disable()
+
+    def test_parallel_render_matches_serial_render(self):
+        with parallel.ParallelRenderer(max_workers=2, threshold=0) as renderer:
+            for pretty in (False, True):
+                self.assertEqual(
+                    renderer.render(self.page, pretty=pretty, doctype=True),
+                    self.page.render(pretty=pretty, doctype=True),
+                )
+
+    def test_parallel_render_pickling_subtrees(self):
+        with mock.patch.object(parallel, '_fork_context', None):
+            with parallel.ParallelRenderer(max_workers=2, threshold=0) as renderer:
+                self.assertEqual(renderer.render(self.page, pretty=True), self.page.render(pretty=True))
+
+    def test_small_trees_are_rendered_serially(self):
+        renderer = parallel.ParallelRenderer(max_workers=2)
+        with mock.patch.object(parallel, 'ProcessPoolExecutor') as executor:
+            self.assertEqual(renderer.render(self.page), self.page.render())
+        executor.assert_not_called()
+
+
+class TestAsyncRendering(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def arender(self, tag, **kwargs):
+        async def collect():
+            return [chunk async for chunk in tag.arender(**kwargs)]
+        return self.loop.run_until_complete(asyncio.wait_for(collect(), timeout=5))
+
+    def test_async_inner_html_renders_like_sync_inner_html(self):
+        async def content():
+            return [Div([], "from a coroutine"), "text"]
+
+        async def rows():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield Li([], f"row {i}")
+
+        def build(content, rows):
+            return Html([], Head([], Title([], "title")), Body([], content, Ul([], rows), Footer([], "footer")))
+
+        for pretty in (False, True):
+            self.assertEqual(
+                "".join(self.arender(build(content(), rows()), pretty=pretty, doctype=True)),
+                build([Div([], "from a coroutine"), "text"], [Li([], f"row {i}") for i in range(3)]).render(
+                    pretty=pretty, doctype=True
+                ),
+            )
+
+    def test_rendered_html_is_yielded_before_waiting(self):
+        async def collect():
+            body_requested = asyncio.Event()
+
+            async def slow_body():
+                await body_requested.wait()
+                return Div([], "body")
+
+            chunks = []
+            async for chunk in Html([], Head([], Title([], "title")), Body([], slow_body())).arender():
+                chunks.append(chunk)
+                body_requested.set()
+            return chunks
+
+        chunks = self.loop.run_until_complete(asyncio.wait_for(collect(), timeout=5))
+        self.assertEqual(chunks[0], "<html><head><title>title</title></head><body>")
+        self.assertEqual("".join(chunks[1:]), "<div>body</div></body></html>")
+
+    def test_async_inner_html_is_produced_concurrently(self):
+        async def collect():
+            second_started = asyncio.Event()
+
+            async def first():
+                await second_started.wait()
+                return "first"
+
+            async def second():
+                second_started.set()
+                return Span([], await asyncio.sleep(0, "second"))
+
+            return [chunk async for chunk in Div([], first(), second()).arender()]
+
+        chunks = self.loop.run_until_complete(asyncio.wait_for(collect(), timeout=5))
+        self.assertEqual("".join(chunks), "<div>first<span>second</span></div>")
+
+    def test_nested_async_inner_html(self):
+        async def inner():
+            return "inner"
+
+        async def outer():
+            return Div([], inner())
+
+        self.assertEqual("".join(self.arender(Div([], outer()))), "<div><div>inner</div></div>")
+
+    def test_sync_render_of_async_inner_html_raises_error(self):
+        async def content():
+            return "text"
+
+        coroutine = content()
+        with self.assertRaises(HtmlBuildError):
+            Div([], coroutine).render()
+        coroutine.close()
+
+    def test_async_inner_html_can_only_be_rendered_once(self):
+        async def rows():
+            yield Li([], "row")
+
+        async def content():
+            return "text"
+
+        for source in (rows(), content()):
+            tag = Ul([], source)
+            self.arender(tag)
+            with self.assertRaises(HtmlBuildError):
+                self.arender(tag)
+
+    def test_closing_the_render_cancels_pending_content(self):
+        cancelled = []
+
+        async def slow(name):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+
+        async def rows():
+            yield "first"
+            await slow("rows")
+
+        async def render():
+            chunks = Div([], P([], "start"), slow("coroutine"), rows()).arender()
+            self.assertEqual(await chunks.__anext__(), "<div><p>start</p>")
+            await chunks.aclose()
+            await asyncio.sleep(0)
+
+        self.loop.run_until_complete(asyncio.wait_for(render(), timeout=5))
+        self.assertEqual(sorted(cancelled), ["coroutine", "rows"])
+
+
+class TestHtmlStream(unittest.TestCase):
+    def stream_sample_page(self, fp, **kwargs):
+        with HtmlStream(fp, **kwargs) as stream:
+            with stream.open(Html()):
+                stream.write(Head([], Title([], "An awesome site")))
+                with stream.open(Body([InlineStyle(background_color='red', bottom='35px')])):
+                    stream.write(Nav([Class("nav pretty")], Div([], "A beautiful NavBar"), Hr()))
+                    with stream.open(Div([Class("user-jose")], Div([], "Jose"))):
+                        with stream.open(Ul()):
+                            for movie in ['A beautiful mind', 'Red']:
+                                stream.write(Li([], movie))
+                    with stream.open(Div([Class("empty")])):
+                        pass
+                    stream.write("text & more", Footer([], "My Footer"))
+
+    def expected_page(self):
+        return Html([],
+            Head([], Title([], "An awesome site")),
+            Body([InlineStyle(background_color='red', bottom='35px')],
+                Nav([Class("nav pretty")], Div([], "A beautiful NavBar"), Hr()),
+                Div([Class("user-jose")], Div([], "Jose"), Ul([], Li([], 'A beautiful mind'), Li([], 'Red'))),
+                Div([Class("empty")]),
+                "text & more",
+                Footer([], "My Footer"),
+            )
+        )
+
+    def test_streamed_html_matches_render(self):
+        for pretty in (False, True):
+            for doctype in (False, True):
+                fp = io.StringIO()
+                self.stream_sample_page(fp, pretty=pretty, doctype=doctype)
+                self.assertEqual(fp.getvalue(), self.expected_page().render(pretty=pretty, doctype=doctype))
+
+    def test_html_is_written_before_the_document_is_finished(self):
+        fp = io.BytesIO()
+        with HtmlStream(fp, encoding="utf-8") as stream:
+            with stream.open(Body()):
+                stream.write(Div([], "first"))
+                self.assertEqual(fp.getvalue(), b"<body><div>first</div>")
+        self.assertEqual(fp.getvalue(), b"<body><div>first</div></body>")
+
+    def test_open_tags_are_closed_with_the_stream(self):
+        fp = io.StringIO()
+        stream = HtmlStream(fp)
+        stream.open(Div())
+        stream.write(Span([], "unfinished"))
+        stream.close()
+        self.assertEqual(fp.getvalue(), "<div><span>unfinished</span></div>")
+
+    def test_script_content_is_not_escaped(self):
+        fp = io.StringIO()
+        with HtmlStream(fp) as stream:
+            with stream.open(Script()):
+                stream.write("if (a < b) {}")
+        self.assertEqual(fp.getvalue(), Script([], "if (a < b) {}").render())
+
+    def test_open_tags_ignore_the_formatter_layout_rules(self):
+        formatter = Formatter(line_width=80, inline_tags=INLINE_TAGS)
+        fp = io.StringIO()
+        with HtmlStream(fp, pretty=formatter) as stream:
+            with stream.open(Div()):
+                with stream.open(P()):
+                    stream.write("short", Span([], "x"))
+                stream.write(P([], "short", Span([], "x")))
+        self.assertEqual(
+            Div([], P([], "short", Span([], "x"))).render(pretty=formatter), "<div>\n  <p>short<span>x</span></p>\n</div>\n"
+        )
+        self.assertEqual(
+            fp.getvalue(),
+            "<div>\n  <p>\n    short\n    <span>x</span>\n  </p>\n  <p>short<span>x</span></p>\n</div>\n",
+        )
+
+    def test_invalid_usage_raises_errors(self):
+        stream = HtmlStream(io.StringIO())
+        with self.assertRaises(NestingError):
+            with stream.open(Hr()):
+                pass
+        with self.assertRaises(HtmlBuildError):
+            stream.write(1)
+
+
+class TestProfiler(unittest.TestCase):
+    def test_stats_are_collected_per_tag_class(self):
+        page = build_sample_page()
+        with Profiler() as profiler:
+            html = page.render()
+        stats = profiler.stats()
+        self.assertEqual(stats["Html"].calls, 1)
+        self.assertEqual(stats["Html"].size, len(html))
+        self.assertEqual(stats["Html"].nodes, sum(stat.calls for stat in stats.values()))
+        self.assertEqual(stats["Li"].calls, 4)
+        self.assertEqual(stats["Li"].size, sum(len(tag.render()) for tag in tags_module._iter_tags(page) if isinstance(tag, Li)))
+        self.assertAlmostEqual(sum(stat.self_time for stat in stats.values()), stats["Html"].total_time)
+        self.assertIn("Li", profiler.report())
+
+    def test_labeled_subtrees_are_grouped_by_label(self):
+        nav = Nav([], Div([], "navigation"))
+        page = Body([], nav, Div([], "content"))
+        profiler = Profiler()
+        profiler.label(nav, "navbar")
+        with profiler:
+            page.render(pretty=True)
+        stats = profiler.stats()
+        self.assertNotIn("Nav", stats)
+        self.assertEqual(stats["navbar"].nodes, 2)
+        self.assertEqual(stats["Div"].calls, 2)
+        self.assertEqual(
+            sorted(line.rsplit(" ", 1)[0] for line in profiler.folded().splitlines()),
+            ["Body", "Body;Div", "Body;navbar", "Body;navbar;Div"],
+        )
+
+    def test_tags_in_a_single_line_are_counted_once(self):
+        formatter = Formatter(line_width=80, inline_tags=INLINE_TAGS)
+        page = Div([], P([], "short ", Span([], "x")), Ul([], Li([], "one"), Li([], "two")))
+        with Profiler() as profiler:
+            html = page.render(pretty=formatter)
+        stats = profiler.stats()
+        self.assertEqual({name: stat.calls for name, stat in stats.items()}, {"Div": 1, "P": 1, "Ul": 1, "Li": 2})
+        self.assertEqual(stats["Div"].size, len(html))
+        self.assertEqual(stats["Li"].size, len("    <li>one</li>\n    <li>two</li>\n"))
+
+    def test_tags_without_end_tag_are_counted(self):
+        page = Div([], Ul([], Li([], "one"), Li([], "two")), P([], "text"))
+        with Profiler() as profiler:
+            html = page.render(minify=True)
+        stats = profiler.stats()
+        self.assertEqual({name: stat.calls for name, stat in stats.items()}, {"Div": 1, "Ul": 1, "Li": 2, "P": 1})
+        self.assertEqual(stats["Div"].nodes, 5)
+        self.assertEqual(stats["Li"].size, len("<li>one<li>two"))
+        self.assertEqual(stats["Div"].size, len(html))
+
+    def test_hook_is_only_active_inside_the_profiler(self):
+        with Profiler():
+            self.assertIsNotNone(tags_module._render_hook)
+        self.assertIsNone(tags_module._render_hook)
+
+
+class TestTreeStats(unittest.TestCase):
+    def assertStatsMatchRender(self, tag):
+        stats = tag.stats()
+        self.assertEqual(stats.compact_size, len(tag.render().encode("utf-8")))
+        self.assertEqual(stats.pretty_size, len(tag.render(pretty=True).encode("utf-8")))
+
+    def test_stats_of_sample_page(self):
+        page = build_sample_page()
+        stats = page.stats()
+        self.assertStatsMatchRender(page)
+        self.assertEqual(stats.depth, 5)
+        self.assertEqual(stats.tags["Li"], 4)
+        self.assertEqual(stats.tags["Div"], 7)
+        self.assertEqual(stats.nodes, sum(stats.tags.values()) + 11)
+        self.assertEqual(stats.text_length, len("An awesome site") + len("A beautiful NavBar") + len("My Footer") +
+                         len("JoseJaimeJhon") + len("A beautiful mindRedThe breakfast clubFight club") +
+                         len("Favorite number is too high"))
+
+    def test_sizes_account_for_escaping_and_encoding(self):
+        tag = Div([Class("a<b"), InlineStyle(content="'ñ'")],
+                  "café & <tea>", Span(), Hr(), Script([], "if (a < b) {}"), Div([], Div([], "€")).freeze())
+        self.assertStatsMatchRender(tag)
+
+    def test_stats_are_kept_until_the_tree_is_modified(self):
+        inner = Ul([], Li([], "one"))
+        page = Div([], inner, Span([], "text"))
+        self.assertEqual(page.stats().tags["Li"], 1)
+        inner.inner_html = [Li([], "one"), Li([], "two")]
+        self.assertEqual(page.stats().tags["Li"], 2)
+        self.assertStatsMatchRender(page)
+
+    def test_stats_of_subtrees_are_reused(self):
+        inner = Ul([], Li([], "one"), Li([], "two"))
+        inner_stats = inner.stats()
+        page = Body([], Div([], inner))
+        with mock.patch.object(Li, '_render_start_tag', side_effect=AssertionError):
+            stats = page.stats()
+        self.assertEqual(stats.nodes, inner_stats.nodes + 2)
+        self.assertEqual(stats.depth, inner_stats.depth + 2)
+        self.assertStatsMatchRender(page)
+
+    def test_lazy_inner_html_raises_error(self):
+        with self.assertRaises(HtmlBuildError):
+            Div([], Lazy(iter([]))).stats()
+
+
+class TestRenderBytes(unittest.TestCase):
+    def test_render_bytes_returns_utf8_html(self):
+        page = Div([], "café", build_sample_page())
+        for pretty in (False, True):
+            self.assertEqual(page.render_bytes(pretty=pretty, doctype=True), page.render(pretty=pretty, doctype=True).encode("utf-8"))
+
+    def test_render_into_preallocated_buffer(self):
+        page = Div([], "café", build_sample_page())
+        for pretty in (False, True):
+            expected = page.render(pretty=pretty, doctype=True).encode("utf-8")
+            buffer = bytearray(b"-" * (len(expected) + 4))
+            written = page.render_into(buffer, offset=2, pretty=pretty, doctype=True, buffer_size=16)
+            self.assertEqual(written, len(expected))
+            self.assertEqual(bytes(buffer), b"--" + expected + b"--")
+
+    def test_render_into_small_buffer_raises_error(self):
+        buffer = bytearray(10)
+        with self.assertRaises(ValueError):
+            build_sample_page().render_into(memoryview(buffer))
+        self.assertEqual(buffer, bytearray(10))
+
+
+class TestFormatter(unittest.TestCase):
+    def test_default_formatter_matches_pretty_render(self):
+        page = build_sample_page()
+        self.assertEqual(page.render(pretty=Formatter(), doctype=True), page.render(pretty=True, doctype=True))
+
+    def test_indentation(self):
+        tag = Div([], Div([], "text", Hr()))
+        self.assertEqual(tag.render(pretty=Formatter(indent_width=4)),
+                         "<div>\n    <div>\n        text\n        <hr/>\n    </div>\n</div>\n")
+        self.assertEqual(tag.render(pretty=Formatter(use_tabs=True)),
+                         "<div>\n\t<div>\n\t\ttext\n\t\t<hr/>\n\t</div>\n</div>\n")
+
+    def test_inline_tags_are_written_in_a_single_line(self):
+        tag = Div([], P([], "Go to ", A([Class("link")], "the ", Span([], "page")), "."))
+        self.assertEqual(
+            tag.render(pretty=Formatter(inline_tags=INLINE_TAGS)),
+            "<div>\n  <p>\n    Go to \n    <a class='link'>the <span>page</span></a>\n    .\n  </p>\n</div>\n",
+        )
+
+    def test_tags_with_text_content_fit_in_line_width(self):
+        tag = Div([], P([], "short ", A([], "link")), P([], "a long paragraph that does not fit"))
+        self.assertEqual(
+            tag.render(pretty=Formatter(line_width=30, inline_tags=[A])),
+            "<div>\n  <p>short <a>link</a></p>\n  <p>\n    a long paragraph that does not fit\n  </p>\n</div>\n",
+        )
+
+    def test_tags_with_placeholders_dont_use_the_line_width(self):
+        formatter = Formatter(line_width=80)
+        tree = Div([], P([], Placeholder("x")), Span([], "short"))
+        template = compile_template(tree, pretty=formatter)
+        self.assertEqual(template.render(), tree.render(pretty=formatter))
+        self.assertEqual(
+            template.render(x=P([], "q")),
+            Div([], P([], P([], "q")), Span([], "short")).render(pretty=formatter),
+        )
+        # the layout is decided when compiling, so short values aren't moved to the line of their tag
+        self.assertEqual(template.render(x="q"), "<div>\n  <p>\n    q\n  </p>\n  <span>short</span>\n</div>\n")
+
+    def test_formatter_in_templates_streams_and_async_renders(self):
+        formatter = Formatter(indent_width=3, inline_tags=INLINE_TAGS)
+        template = compile_template(Div([], Span([], Placeholder("name")), P([], Placeholder("text"))), pretty=formatter)
+        self.assertEqual(
+            template.render(name="a & b", text="c"),
+            Div([], Span([], "a & b"), P([], "c")).render(pretty=formatter),
+        )
+
+        fp = io.StringIO()
+        with HtmlStream(fp, pretty=formatter) as stream:
+            with stream.open(Div()):
+                stream.write(P([], "text", Span([], "inline")))
+        self.assertEqual(fp.getvalue(), Div([], P([], "text", Span([], "inline"))).render(pretty=formatter))
+
+        async def content():
+            return "async"
+
+        loop = asyncio.new_event_loop()
+        try:
+            html = loop.run_until_complete(self.collect(Div([], Span([], content()), P([], "x")).arender(pretty=formatter)))
+        finally:
+            loop.close()
+        # tags with asynchronous inner html are laid out in multiple lines
+        self.assertEqual(html, Div([], Span([], "async"), P([], "x")).render(pretty=formatter.without_layout_rules()))
+
+    async def collect(self, chunks):
+        return "".join([chunk async for chunk in chunks])
+
+
+class TestMinifiedRendering(unittest.TestCase):
+    def test_minified_html(self):
+        tag = Body([Class("main page"), Id("main")],
+            Ul([], Li([], "one  \n  two"), Li([], "three")),
+            Div([], P([], "first"), P([], "second"), "text"),
+            P([], "last"),
+            Table([], Tr([], Th([], "a"), Td([], "1")), Tr([], Td([], "2"))),
+            Select([], Option([], "x"), Option([], "y")),
+            Img([Src("image.png")]), Br(),
+        )
+        self.assertEqual(
+            tag.render(minify=True),
+            "<body class='main page' id=main><ul><li>one two<li>three</ul><div><p>first<p>second</p>text</div>"
+            "<p>last<table><tr><th>a<td>1<tr><td>2</table><select><option>x<option>y</select><img src=image.png><br>"
+            "</body>",
+        )
+
+    def test_whitespace_is_kept_in_preformatted_tags(self):
+        tag = Div([], Pre([], "a   b\n", Span([], "  c  ")), Script([], "if (a  <  b) {}"), " x  y ")
+        self.assertEqual(
+            tag.render(minify=True),
+            "<div><pre>a   b\n<span>  c  </span></pre><script>if (a  <  b) {}</script> x y </div>",
+        )
+
+    def test_attribute_values_are_quoted_when_needed(self):
+        tag = A([Href("/path?a=1&b=2"), Class(""), InlineStyle(color="red"), Data_("x", "it's")], "link")
+        self.assertEqual(
+            tag.render(minify=True),
+            "<a href='/path?a=1&amp;b=2' class='' style='color: red' data-x=it&#x27;s>link</a>",
+        )
+
+    def test_end_tags_are_kept_where_required(self):
+        self.assertEqual(A([], P([], "text")).render(minify=True), "<a><p>text</p></a>")
+        self.assertEqual(Ul([], Li([], "one"), "text").render(minify=True), "<ul><li>one</li>text</ul>")
+        self.assertEqual(Div([], P([], "one"), Span([], "two")).render(minify=True), "<div><p>one</p><span>two</span></div>")
+
+    def test_async_inner_html_is_minified(self):
+        async def content(text):
+            return Span([], text)
+
+        async def collect(tag):
+            return "".join([chunk async for chunk in tag.arender(minify=True)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            tag = Ul([Class("a b")], Li([], content(" one   two ")), Li([], "three"))
+            self.assertEqual(loop.run_until_complete(collect(tag)), "<ul class='a b'><li><span> one two </span><li>three</ul>")
+            tag = Div([], Pre([Class("a b")], "a  b", content(" c  d ")), " e  f ")
+            self.assertEqual(
+                loop.run_until_complete(collect(tag)), "<div><pre class='a b'>a  b<span> c  d </span></pre> e f </div>"
+            )
+        finally:
+            loop.close()
+
+    def test_minify_and_pretty_cant_be_combined(self):
+        with self.assertRaises(HtmlBuildError):
+            Div().render(pretty=True, minify=True)
+
+    def test_minified_html_is_cached_apart(self):
+        tag = Div([], Ul([], Li([], "a  b")))
+        self.assertEqual(tag.render(cache=True, minify=True), "<div><ul><li>a b</ul></div>")
+        self.assertEqual(tag.render(cache=True), "<div><ul><li>a  b</li></ul></div>")
+        self.assertEqual(tag.render_bytes(minify=True), b"<div><ul><li>a b</ul></div>")
+
+
+class TestCompressedRendering(unittest.TestCase):
+    def test_compressed_html(self):
+        page = build_sample_page()
+        self.assertEqual(gzip.decompress(page.render_compressed()), page.render_bytes())
+        self.assertEqual(zlib.decompress(page.render_compressed("deflate", level=9, pretty=True)), page.render_bytes(pretty=True))
+        self.assertEqual(bz2.decompress(page.render_compressed("bz2", minify=True)), page.render_bytes(minify=True))
+
+    def test_html_is_compressed_while_rendered(self):
+        produced = []
+
+        def rows():
+            for i in range(5000):
+                produced.append(i)
+                yield Div([], f"row {i} " * 20)
+
+        chunks = Div([], Lazy(rows())).iter_compressed(level=1, buffer_size=1024)
+        first = next(chunks)
+        self.assertLess(len(produced), 5000)
+        html = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(first + b"".join(chunks))
+        self.assertEqual(html, Div([], [Div([], f"row {i} " * 20) for i in range(5000)]).render_bytes())
+
+    def test_custom_codecs(self):
+        class Identity:
+            def compress(self, data):
+                return data
+
+            def flush(self):
+                return b""
+
+        with mock.patch.dict(compression._codecs):
+            compression.register_codec("identity", lambda level: Identity())
+            self.assertEqual(Div([], "text").render_compressed("identity"), b"<div>text</div>")
+        with self.assertRaises(HtmlBuildError):
+            Div().render_compressed("identity")
+
+
+class TestStructuralHash(unittest.TestCase):
+    def test_identical_structures_have_the_same_hash(self):
+        self.assertEqual(build_sample_page().structural_hash(), build_sample_page().structural_hash())
+        self.assertEqual(Text("a").structural_hash(), Text("a").structural_hash())
+        self.assertEqual(Class("a").structural_hash(), Class("a").structural_hash())
+
+    def test_hash_is_stable_between_processes(self):
+        self.assertEqual(Div([Class("a")], "text", Span([], "x")).structural_hash(), "5449f9fa56e71e2f7983777a31fe89f8")
+
+    def test_different_structures_have_different_hashes(self):
+        trees = [
+            Div(), Span(), Div([Class("a")]), Div([Class("b")]), Div([Id("a")]), Div([], "a"), Div([], "b"),
+            Div([], Markup("a")), Div([], "a", "b"), Div([], "ab"), Div([], Div()), Div([], Div(), Div()),
+            Div([], Div([], Div())),
+        ]
+        self.assertEqual(len({tree.structural_hash() for tree in trees}), len(trees))
+
+    def test_hash_changes_when_the_tree_is_modified(self):
+        inner = Ul([], Li([], "one"))
+        page = Div([], inner)
+        before = page.structural_hash()
+        inner.inner_html = [Li([], "two")]
+        self.assertNotEqual(page.structural_hash(), before)
+        changed = page.structural_hash()
+        inner.inner_html.append(Li([], "three"))
+        inner.invalidate()
+        self.assertNotEqual(page.structural_hash(), changed)
+
+    def test_trees_with_lazy_inner_html_cant_be_hashed(self):
+        with self.assertRaises(HtmlBuildError):
+            Div([], Div([], Lazy([]))).structural_hash()
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = fragments.FragmentCache(min_nodes=2)
+        tags_module.set_fragment_cache(self.cache)
+
+    def tearDown(self):
+        fragments.disable()
+
+    def card(self, name):
+        return Div([Class("card")], Span([], name), A([Href(f"/{name}")], "more"))
+
+    def test_identical_subtrees_are_rendered_once(self):
+        card_a = "<div class='card'><span>a</span><a href='/a'>more</a></div>"
+        card_b = "<div class='card'><span>b</span><a href='/b'>more</a></div>"
+        self.assertEqual(Div([], self.card("a"), self.card("b")).render(), f"<div>{card_a}{card_b}</div>")
+        self.assertEqual(self.cache.cache_info().hits, 0)
+        self.assertEqual(Body([], self.card("b")).render(), f"<body>{card_b}</body>")
+        self.assertEqual(self.cache.cache_info().hits, 1)
+
+    def test_render_options_are_cached_apart(self):
+        Div([], self.card("a")).render()
+        self.assertEqual(Div([], self.card("a")).render(pretty=True), Div([], self.card("a"))._render(True, 0))
+        self.assertEqual(Div([], self.card("a")).render(minify=True), "<div><div class=card><span>a</span><a href=/a>more</a></div></div>")
+
+    def test_modified_subtrees_are_rendered_again(self):
+        card = self.card("a")
+        page = Div([], card)
+        page.render()
+        card.inner_html[0].inner_html = ["changed"]
+        fragments.disable()
+        expected = page.render()
+        tags_module.set_fragment_cache(self.cache)
+        self.assertEqual(page.render(), expected)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = fragments.enable(max_entries=2, min_nodes=5)
+        for name in ("a", "b", "c"):
+            self.card(name).render()
+        self.card("a").render()
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.evictions, info.entries), (0, 2, 2))
+
+        cache = fragments.enable(max_bytes=len(self.card("a").render()) + 10, min_nodes=5)
+        self.card("a").render()
+        self.card("b").render()
+        self.assertEqual(cache.cache_info().entries, 1)
+        self.assertLessEqual(cache.cache_info().bytes, cache.max_bytes)
+
+
+class TestComponents(unittest.TestCase):
+    def test_calls_with_the_same_arguments_return_the_same_tag(self):
+        calls = []
+
+        @component
+        def nav(title, active=None):
+            calls.append(title)
+            return Nav([], Div([], title), Span([], active or ""))
+
+        self.assertIs(nav("Home"), nav("Home"))
+        self.assertIsNot(nav("Home"), nav("About"))
+        self.assertIsNot(nav("Home"), nav("Home", active="x"))
+        self.assertEqual(calls, ["Home", "About", "Home"])
+        self.assertEqual(nav.cache_info(), (3, 3, 128, 3))
+        self.assertTrue(nav("Home").frozen)
+        self.assertEqual(Body([], nav("Home")).render(), "<body><nav><div>Home</div><span></span></nav></body>")
+
+    def test_ignored_arguments_are_left_out_of_the_key(self):
+        @component(ignore=['request'])
+        def card(title, request=None):
+            return Div([], title)
+
+        self.assertIs(card("a", request=1), card("a", 2))
+        self.assertIsNot(card("a"), card(title="b"))
+        with self.assertRaises(HtmlBuildError):
+            component(ignore=['missing'])(lambda title: Div([], title))
+
+    def test_extra_keyword_arguments_are_part_of_the_key(self):
+        @component(ignore=['request'])
+        def card(title, request=None, **attributes):
+            return Div([Class(attributes.get("cls", ""))], title)
+
+        self.assertIs(card("a"), card("a", request=1))
+        self.assertIs(card("a", cls="x", id="y"), card("a", id="y", cls="x"))
+        self.assertIsNot(card("a", cls="x"), card("a"))
+
+    def test_least_recently_used_results_are_discarded(self):
+        @component(maxsize=2)
+        def item(text):
+            return Li([], text)
+
+        first = item("a")
+        item("b")
+        item("a")
+        item("c")
+        self.assertIs(item("a"), first)
+        self.assertEqual(item.cache_info().currsize, 2)
+        second = item("b")
+        self.assertEqual(item.cache_info().misses, 4)
+        item.cache_clear()
+        self.assertIsNot(item("b"), second)
+        self.assertEqual(item.cache_info(), (0, 1, 2, 1))
+
+    def test_results_expire_after_their_ttl(self):
+        @component(ttl=10)
+        def item(text):
+            return Li([], text)
+
+        with mock.patch('htmlBuilder.components.monotonic', return_value=100):
+            first = item("a")
+            self.assertIs(item("a"), first)
+        with mock.patch('htmlBuilder.components.monotonic', return_value=111):
+            self.assertIsNot(item("a"), first)
+
+    def test_components_must_return_a_tag(self):
+        with self.assertRaises(HtmlBuildError):
+            component(lambda: "text")()
@@ -1,11 +1,146 @@
 import collections.abc
+import html
+import io
+import re
+
+DEFAULT_WRITE_BUFFER_SIZE = 64 * 1024
+ESCAPE_CACHE_SIZE = 4096
+ESCAPE_CACHE_MAX_LENGTH = 128
+
+
+class Markup(str):
+    """A string that is already valid html, it's rendered as it is instead of being escaped"""
+    __slots__ = ()
+
+    def __html__(self):
+        return self
+
+
+_needs_escaping = re.compile(r"[&<>\"']").search
+_escape_cache = {}
+
+
+def escape(value) -> str:
+    """Escapes html special characters (&, <, >, " and ') of a value.
+
+    Markup instances (or any object with an __html__ method) are returned unescaped. Strings without special
+    characters are returned as they are, and results for short strings are memoized.
+    """
+    if value.__class__ is not str:
+        if hasattr(value, '__html__'):
+            return value.__html__()
+        value = str(value)
+
+    if len(value) > ESCAPE_CACHE_MAX_LENGTH:
+        return html.escape(value) if _needs_escaping(value) else value
+
+    escaped = _escape_cache.get(value)
+    if escaped is None:
+        escaped = html.escape(value) if _needs_escaping(value) else value
+        if len(_escape_cache) >= ESCAPE_CACHE_SIZE:
+            _escape_cache.clear()
+        _escape_cache[value] = escaped
+    return escaped
+
+
+_iterable_classes = {list: True, tuple: True, str: False}
+
+
+def _is_iterable(cls) -> bool:
+    try:
+        return _iterable_classes[cls]
+    except KeyError:
+        iterable = (
+            issubclass(cls, collections.abc.Iterable) and
+            not issubclass(cls, (str, collections.abc.Awaitable))  # futures are iterable
+        )
+        _iterable_classes[cls] = iterable
+        return iterable
+
 
 def flatten_params(params):
+    """Returns all the non iterable elements (strings are not considered iterables) nested in `params` as a flat list.
+
+    Nested iterables are walked with an explicit stack of iterators, so any nesting depth is supported. Whether a
+    class is iterable is only checked once per class.
+    """
     result = []
-    for item in params:
-        if issubclass(item.__class__, collections.abc.Iterable) and not issubclass(item.__class__, str):
-            for element in flatten_params(item):
-                result.append(element)
+    append = result.append
+    iterable_classes = _iterable_classes
+    stack = [iter(params)]
+    while stack:
+        for item in stack[-1]:
+            cls = item.__class__
+            iterable = iterable_classes.get(cls)
+            if iterable is None:
+                iterable = _is_iterable(cls)
+            if iterable:
+                stack.append(iter(item))
+                break
+            append(item)
         else:
-            result.append(item)
+            stack.pop()
     return result
+
+
+class _BufferWriter:
+    """Binary stream writing into a preallocated buffer (anything supporting the buffer protocol) from `offset`"""
+    mode = 'wb'
+
+    def __init__(self, buffer, offset=0):
+        self._view = memoryview(buffer).cast('B')
+        self.position = offset
+
+    def write(self, data):
+        end = self.position + len(data)
+        if end > len(self._view):
+            raise ValueError(f"Buffer of {len(self._view)} bytes is too small, at least {end} bytes are needed")
+        self._view[self.position:end] = data
+        self.position = end
+        return len(data)
+
+
+def _get_writer(fp, encoding):
+    if isinstance(fp, bytearray):
+        return fp.extend, True
+    if isinstance(fp, io.TextIOBase):
+        return fp.write, False
+    if not hasattr(fp, 'write') and hasattr(fp, 'sendall'):  # sockets
+        return fp.sendall, True
+    binary = (
+        isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or
+        'b' in getattr(fp, 'mode', '') or
+        encoding is not None
+    )
+    return fp.write, binary
+
+
+def write_chunks(chunks, fp, encoding=None, buffer_size=DEFAULT_WRITE_BUFFER_SIZE) -> int:
+    """Writes an iterable of strings into a text stream, binary stream, socket or bytearray.
+
+    Chunks are grouped in writes of at least `buffer_size` characters, binary targets receive
+    them encoded with `encoding` (utf-8 by default). Returns the number of characters or bytes written.
+    """
+    write, binary = _get_writer(fp, encoding)
+    encoding = encoding or 'utf-8'
+    written = 0
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            data = "".join(buffer)
+            if binary:
+                data = data.encode(encoding)
+            write(data)
+            written += len(data)
+            buffer = []
+            buffered = 0
+    if buffer:
+        data = "".join(buffer)
+        if binary:
+            data = data.encode(encoding)
+        write(data)
+        written += len(data)
+    return written